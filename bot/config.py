@@ -22,3 +22,6 @@ PROFILE_AGE, PROFILE_HEIGHT, PROFILE_WEIGHT, PROFILE_BUILD, PROFILE_AVAILABILITY
 PACKAGES = PACKAGE_PRICES
 TELEGRAM_TOKEN = TELEGRAM_BOT_TOKEN
 CITIES = CITIES_RICH
+
+# Admin chat id parsed once for send_message(chat_id=...); None when unset or invalid
+ADMIN_CHAT_ID_INT = int(ADMIN_CHAT_ID) if ADMIN_CHAT_ID and ADMIN_CHAT_ID.lstrip("-").isdigit() else None
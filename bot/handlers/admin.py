@@ -3,7 +3,6 @@ Blackbook Bot - Admin Handlers
 Handles: /partner, /maintenance, /broadcast, /portal_pending
 """
 import logging
-import httpx
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.error import BadRequest
 from telegram.ext import (
@@ -12,6 +11,8 @@ from telegram.ext import (
 )
 
 from config import is_admin, is_authorized_partner, TELEGRAM_TOKEN
+from db_context import get_db
+from utils.http_client import post_json
 
 logger = logging.getLogger(__name__)
 
@@ -31,12 +32,6 @@ REJECT_REASON_TEMPLATES = {
 PORTAL_PENDING_PAGE_SIZE = 5
 
 
-def get_db():
-    """Gets the database instance from db_context module."""
-    from db_context import get_db as _get_db
-    return _get_db()
-
-
 async def _safe_edit_message_text(
     query,
     text: str,
@@ -63,18 +58,17 @@ async def send_provider_message(chat_id: int, text: str, parse_mode: str = "Mark
         logger.error("❌ TELEGRAM_TOKEN missing; cannot notify provider.")
         return False
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.post(
-                f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage",
-                json={
-                    "chat_id": int(chat_id),
-                    "text": text,
-                    "parse_mode": parse_mode,
-                },
-            )
-            if resp.status_code != 200:
-                logger.warning(f"Failed provider notification ({chat_id}): {resp.text}")
-                return False
+        resp = await post_json(
+            f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage",
+            {
+                "chat_id": int(chat_id),
+                "text": text,
+                "parse_mode": parse_mode,
+            },
+        )
+        if resp.status_code != 200:
+            logger.warning(f"Failed provider notification ({chat_id}): {resp.text}")
+            return False
         return True
     except Exception as e:
         logger.warning(f"Provider notification error ({chat_id}): {e}")
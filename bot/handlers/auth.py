@@ -18,6 +18,7 @@ from config import (
     ADMIN_CHAT_ID,
     CITIES,
 )
+from db_context import get_db
 from utils.keyboards import (
     get_main_menu_keyboard,
     get_persistent_main_menu,
@@ -41,11 +42,6 @@ logger = logging.getLogger(__name__)
 
 # ==================== HELPER FUNCTIONS ====================
 
-def get_db():
-    """Gets the database instance from db_context module."""
-    from db_context import get_db as _get_db
-    return _get_db()
-
 
 def build_go_live_checklist(provider: dict) -> tuple[str, InlineKeyboardMarkup]:
     """Builds checklist text + actionable keyboard for activation funnel."""
@@ -24,6 +24,7 @@ from config import (
     PREMIUM_VERIFY_PRICE,
     FREE_TRIAL_DAYS,
 )
+from db_context import get_db
 from utils.keyboards import (
     get_package_keyboard,
     get_menu_package_keyboard,
@@ -39,12 +40,6 @@ from services.metapay import initiate_stk_push
 logger = logging.getLogger(__name__)
 
 
-def get_db():
-    """Gets the database instance from db_context module."""
-    from db_context import get_db as _get_db
-    return _get_db()
-
-
 def _is_trial_eligible(provider: dict) -> bool:
     if not provider:
         return False
@@ -1,3 +1,4 @@
+import json
 import logging
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton, InputMediaPhoto
 from telegram.ext import ContextTypes
@@ -12,6 +13,18 @@ from utils.keyboards import (
 
 logger = logging.getLogger(__name__)
 
+
+def _provider_photos(provider: dict) -> list:
+    """Returns profile_photos as a list; the column may hold a JSON string."""
+    photos = provider.get("profile_photos") or []
+    if isinstance(photos, str):
+        try:
+            photos = json.loads(photos)
+        except (json.JSONDecodeError, TypeError):
+            photos = []
+    return photos
+
+
 async def photos_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handles /photos command for photo gallery management."""
     user = update.effective_user
@@ -25,13 +38,7 @@ async def photos_command(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         )
         return
     
-    photos = provider.get("profile_photos") or []
-    if isinstance(photos, str):
-        import json
-        try:
-            photos = json.loads(photos)
-        except (json.JSONDecodeError, TypeError):
-            photos = []
+    photos = _provider_photos(provider)
     
     photo_count = len(photos)
     
@@ -54,13 +61,7 @@ async def photos_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     data = query.data
     
     provider = db.get_provider(user.id)
-    photos = provider.get("profile_photos") or []
-    if isinstance(photos, str):
-        import json
-        try:
-            photos = json.loads(photos)
-        except (json.JSONDecodeError, TypeError):
-            photos = []
+    photos = _provider_photos(provider)
     
     # View photos (first photo or specific index)
     if data == "photos_view" or data.startswith("photo_view_"):
@@ -218,13 +219,7 @@ async def handle_photo_add_mode(update: Update, context: ContextTypes.DEFAULT_TY
         context.user_data.pop("photo_add_mode", None)
         return
 
-    photos = provider.get("profile_photos") or []
-    if isinstance(photos, str):
-        import json
-        try:
-            photos = json.loads(photos)
-        except (json.JSONDecodeError, TypeError):
-            photos = []
+    photos = _provider_photos(provider)
 
     if not update.message.photo:
         await update.message.reply_text("⚠️ Please send a photo.")
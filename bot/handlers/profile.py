@@ -1,6 +1,8 @@
 import logging
 import json
 import re
+from enum import IntEnum
+from typing import Awaitable, Callable
 from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import (
     ContextTypes, 
@@ -22,9 +24,10 @@ from db_context import get_db
 from utils.keyboards import (
     get_profile_keyboard, get_full_profile_keyboard, get_city_keyboard,
     get_build_keyboard, get_availability_keyboard, get_services_keyboard,
-    get_languages_keyboard, get_persistent_main_menu
+    get_languages_keyboard, get_persistent_main_menu, MAIN_MENU_BUTTONS
 )
 from utils.formatters import format_full_profile_text
+from utils.filters import UserDataFlagFilter
 from handlers.verification import (
     is_verification_pending,
     send_admin_verification_request
@@ -35,6 +38,19 @@ logger = logging.getLogger(__name__)
 PROFILE_REQUIRED_FIELDS = ["age", "height_cm", "weight_kg", "build", "services", "bio", "profile_photos"]
 PROFILE_FLOW_TOTAL_STEPS = 11
 
+
+class _EditState(IntEnum):
+    """Profile section currently being edited via free-text input."""
+    NAME = 1
+    BIO = 2
+    AGE = 3
+    HEIGHT = 4
+    WEIGHT = 5
+    RATES = 6
+    SERVICES = 7
+    LOCATION = 8
+
+
 def is_profile_complete(provider: dict) -> bool:
     """Checks if key profile data required for listing exists."""
     if not provider:
@@ -103,13 +119,12 @@ async def complete_profile(update: Update, context: ContextTypes.DEFAULT_TYPE) -
 async def profile_age(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Stores age and asks for height."""
     text = update.message.text.strip()
-    
+
     # Allow user to exit by clicking menu buttons
-    menu_buttons = ["👑 The Collection", "👤 My Profile", "💰 Top up Balance", "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules"]
-    if text in menu_buttons or text.startswith("/"):
+    if text in MAIN_MENU_BUTTONS or text.startswith("/"):
         await update.message.reply_text("❌ Profile completion cancelled. Tap 👤 My Profile to start again.")
         return ConversationHandler.END
-    
+
     try:
         age = int(text)
         if age < 18 or age > 60:
@@ -119,7 +134,7 @@ async def profile_age(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     except ValueError:
         await update.message.reply_text("⚠️ Please enter a valid number (e.g., 24).")
         return PROFILE_AGE
-        
+
     await update.message.reply_text(
         format_profile_step(
             2,
@@ -133,19 +148,18 @@ async def profile_age(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
 async def profile_height(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Stores height and asks for weight."""
     text = update.message.text.strip()
-    
-    menu_buttons = ["👑 The Collection", "👤 My Profile", "💰 Top up Balance", "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules"]
-    if text in menu_buttons or text.startswith("/"):
+
+    if text in MAIN_MENU_BUTTONS or text.startswith("/"):
         await update.message.reply_text("❌ Profile completion cancelled. Use /complete_profile to start again.")
         return ConversationHandler.END
-    
+
     try:
         height = int(text)
         context.user_data["p_height"] = height
     except ValueError:
         await update.message.reply_text("⚠️ Please enter a valid number (e.g., 170).")
         return PROFILE_HEIGHT
-        
+
     await update.message.reply_text(
         format_profile_step(
             3,
@@ -159,19 +173,18 @@ async def profile_height(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 async def profile_weight(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Stores weight and asks for build."""
     text = update.message.text.strip()
-    
-    menu_buttons = ["👑 The Collection", "👤 My Profile", "💰 Top up Balance", "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules"]
-    if text in menu_buttons or text.startswith("/"):
+
+    if text in MAIN_MENU_BUTTONS or text.startswith("/"):
         await update.message.reply_text("❌ Profile completion cancelled. Use /complete_profile to start again.")
         return ConversationHandler.END
-    
+
     try:
         weight = int(text)
         context.user_data["p_weight"] = weight
     except ValueError:
         await update.message.reply_text("⚠️ Please enter a valid number (e.g., 55).")
         return PROFILE_WEIGHT
-        
+
     await update.message.reply_text(
         format_profile_step(
             4,
@@ -267,8 +280,7 @@ async def profile_bio(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int
     """Stores bio and asks for nearby places."""
     bio = update.message.text.strip()
     
-    menu_buttons = ["👑 The Collection", "👤 My Profile", "💰 Top up Balance", "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules"]
-    if bio in menu_buttons or bio.startswith("/"):
+    if bio in MAIN_MENU_BUTTONS or bio.startswith("/"):
         await update.message.reply_text("❌ Profile completion cancelled. Use /complete_profile to start again.")
         return ConversationHandler.END
     
@@ -294,8 +306,7 @@ async def profile_nearby(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     """Stores nearby places and asks for photos."""
     nearby = update.message.text.strip()
     
-    menu_buttons = ["👑 The Collection", "👤 My Profile", "💰 Top up Balance", "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules"]
-    if nearby in menu_buttons or nearby.startswith("/"):
+    if nearby in MAIN_MENU_BUTTONS or nearby.startswith("/"):
         await update.message.reply_text("❌ Profile completion cancelled. Use /complete_profile to start again.")
         return ConversationHandler.END
     
@@ -395,8 +406,7 @@ async def profile_rates(update: Update, context: ContextTypes.DEFAULT_TYPE) -> i
     """Parses and stores hourly rates."""
     text = update.message.text.strip()
     
-    menu_buttons = ["👑 The Collection", "👤 My Profile", "💰 Top up Balance", "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules"]
-    if text in menu_buttons or text.startswith("/"):
+    if text in MAIN_MENU_BUTTONS or text.startswith("/"):
         await update.message.reply_text("❌ Profile completion cancelled. Use /complete_profile to start again.")
         return ConversationHandler.END
     
@@ -692,7 +702,7 @@ async def edit_section_callback(update: Update, context: ContextTypes.DEFAULT_TY
             ]),
             parse_mode="Markdown"
         )
-        context.user_data["editing"] = "name"
+        context.user_data["editing"] = _EditState.NAME
         return
     
     elif data == "edit_stats":
@@ -708,7 +718,7 @@ async def edit_section_callback(update: Update, context: ContextTypes.DEFAULT_TY
             ]),
             parse_mode="Markdown"
         )
-        context.user_data["editing"] = "age"
+        context.user_data["editing"] = _EditState.AGE
         return
     
     elif data == "edit_bio":
@@ -724,7 +734,7 @@ async def edit_section_callback(update: Update, context: ContextTypes.DEFAULT_TY
             ]),
             parse_mode="Markdown"
         )
-        context.user_data["editing"] = "bio"
+        context.user_data["editing"] = _EditState.BIO
         return
     
     elif data == "edit_services":
@@ -734,7 +744,7 @@ async def edit_section_callback(update: Update, context: ContextTypes.DEFAULT_TY
             reply_markup=get_services_keyboard(context.user_data.get("selected_services", [])),
             parse_mode="Markdown"
         )
-        context.user_data["editing"] = "services"
+        context.user_data["editing"] = _EditState.SERVICES
         return
     
     elif data == "edit_rates":
@@ -751,7 +761,7 @@ async def edit_section_callback(update: Update, context: ContextTypes.DEFAULT_TY
             ]),
             parse_mode="Markdown"
         )
-        context.user_data["editing"] = "rates"
+        context.user_data["editing"] = _EditState.RATES
         return
     
     elif data == "edit_location":
@@ -761,17 +771,137 @@ async def edit_section_callback(update: Update, context: ContextTypes.DEFAULT_TY
             reply_markup=get_city_keyboard(),
             parse_mode="Markdown"
         )
-        context.user_data["editing"] = "location"
+        context.user_data["editing"] = _EditState.LOCATION
         return
 
 
+async def _edit_name(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, text: str) -> bool:
+    """Updates the stage name."""
+    get_db().update_provider_profile(user_id, {"display_name": text})
+    await update.message.reply_text(
+        f"✅ *Name Updated!*\n\nYour stage name is now: *{text}*",
+        parse_mode="Markdown"
+    )
+    return True
+
+
+async def _edit_bio(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, text: str) -> bool:
+    """Updates the bio."""
+    get_db().update_provider_profile(user_id, {"bio": text})
+    await update.message.reply_text(
+        f"✅ *Bio Updated!*\n\nYour new bio has been saved.",
+        parse_mode="Markdown"
+    )
+    return True
+
+
+async def _edit_age(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, text: str) -> bool:
+    """Updates age, then moves on to height."""
+    try:
+        age = int(text)
+    except ValueError:
+        await update.message.reply_text("⚠️ Please enter a valid number for age:")
+        return False
+    if age < 18 or age > 65:
+        await update.message.reply_text("⚠️ Age must be between 18-65. Try again:")
+        return False
+    get_db().update_provider_profile(user_id, {"age": age})
+    await update.message.reply_text(
+        f"✅ *Age Updated!*\n\nNow send your height in cm (e.g. 165):",
+        parse_mode="Markdown"
+    )
+    context.user_data["editing"] = _EditState.HEIGHT
+    return False
+
+
+async def _edit_height(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, text: str) -> bool:
+    """Updates height, then moves on to weight."""
+    try:
+        height = int(text)
+    except ValueError:
+        await update.message.reply_text("⚠️ Please enter a valid number for height:")
+        return False
+    get_db().update_provider_profile(user_id, {"height_cm": height})
+    await update.message.reply_text(
+        f"✅ *Height Updated!*\n\nNow send your weight in kg:",
+        parse_mode="Markdown"
+    )
+    context.user_data["editing"] = _EditState.WEIGHT
+    return False
+
+
+async def _edit_weight(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, text: str) -> bool:
+    """Updates weight, completing the stats edit."""
+    try:
+        weight = int(text)
+    except ValueError:
+        await update.message.reply_text("⚠️ Please enter a valid number for weight:")
+        return False
+    get_db().update_provider_profile(user_id, {"weight_kg": weight})
+    await update.message.reply_text(
+        f"✅ *Stats Updated!*\n\nAge, height and weight have been saved.",
+        parse_mode="Markdown"
+    )
+    return True
+
+
+async def _edit_rates(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int, text: str) -> bool:
+    """Parses and updates hourly rates."""
+    lines = text.split("\n")
+    rates = {}
+    for line in lines:
+        match = re.match(r"(\w+):\s*(\d+)", line)
+        if match:
+            period, amount = match.groups()
+            if "30" in period:
+                rates["rate_30min"] = int(amount)
+            elif "1" in period:
+                rates["rate_1hr"] = int(amount)
+            elif "2" in period:
+                rates["rate_2hr"] = int(amount)
+            elif "3" in period:
+                rates["rate_3hr"] = int(amount)
+            elif "over" in period.lower():
+                rates["rate_overnight"] = int(amount)
+    
+    if not rates:
+        await update.message.reply_text("⚠️ Could not parse rates. Use format:\n`30min: 3000`\n`1hr: 5000`", parse_mode="Markdown")
+        return False
+    get_db().update_provider_profile(user_id, rates)
+    await update.message.reply_text(
+        "✅ *Rates Updated!*\n\nYour new rates have been saved.",
+        parse_mode="Markdown"
+    )
+    return True
+
+
+# Text-input handlers per edit state. Each returns True when the section is
+# finished (profile is re-shown) or False to stay in edit mode.
+# SERVICES and LOCATION are driven by callbacks, so text just exits edit mode.
+_EDIT_HANDLERS: dict[_EditState, Callable[..., Awaitable[bool]]] = {
+    _EditState.NAME: _edit_name,
+    _EditState.BIO: _edit_bio,
+    _EditState.AGE: _edit_age,
+    _EditState.HEIGHT: _edit_height,
+    _EditState.WEIGHT: _edit_weight,
+    _EditState.RATES: _edit_rates,
+}
+
+
 async def handle_edit_input(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handles text input when user is editing a profile section."""
     editing = context.user_data.get("editing")
     
     if not editing:
         return  # Not in edit mode, let other handlers process
-    
+    if isinstance(editing, str):
+        # Persisted before the IntEnum switch as "name", "bio", "height", ...
+        editing = _EditState.__members__.get(editing.upper())
+        if editing is None:
+            context.user_data.pop("editing", None)
+            return
+        context.user_data["editing"] = editing
+
     user = update.effective_user
     db = get_db()
     text = update.message.text.strip()
@@ -786,90 +916,9 @@ async def handle_edit_input(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
     
-    if editing == "name":
-        db.update_provider_profile(user.id, {"display_name": text})
-        await update.message.reply_text(
-            f"✅ *Name Updated!*\n\nYour stage name is now: *{text}*",
-            parse_mode="Markdown"
-        )
-    
-    elif editing == "bio":
-        db.update_provider_profile(user.id, {"bio": text})
-        await update.message.reply_text(
-            f"✅ *Bio Updated!*\n\nYour new bio has been saved.",
-            parse_mode="Markdown"
-        )
-    
-    elif editing == "age":
-        try:
-            age = int(text)
-            if age < 18 or age > 65:
-                await update.message.reply_text("⚠️ Age must be between 18-65. Try again:")
-                return
-            db.update_provider_profile(user.id, {"age": age})
-            await update.message.reply_text(
-                f"✅ *Age Updated!*\n\nNow send your height in cm (e.g. 165):",
-                parse_mode="Markdown"
-            )
-            context.user_data["editing"] = "height"
-            return
-        except ValueError:
-            await update.message.reply_text("⚠️ Please enter a valid number for age:")
-            return
-    
-    elif editing == "height":
-        try:
-            height = int(text)
-            db.update_provider_profile(user.id, {"height_cm": height})
-            await update.message.reply_text(
-                f"✅ *Height Updated!*\n\nNow send your weight in kg:",
-                parse_mode="Markdown"
-            )
-            context.user_data["editing"] = "weight"
-            return
-        except ValueError:
-            await update.message.reply_text("⚠️ Please enter a valid number for height:")
-            return
-    
-    elif editing == "weight":
-        try:
-            weight = int(text)
-            db.update_provider_profile(user.id, {"weight_kg": weight})
-            await update.message.reply_text(
-                f"✅ *Stats Updated!*\n\nAge, height and weight have been saved.",
-                parse_mode="Markdown"
-            )
-        except ValueError:
-            await update.message.reply_text("⚠️ Please enter a valid number for weight:")
-            return
-    
-    elif editing == "rates":
-        lines = text.split("\n")
-        rates = {}
-        for line in lines:
-            match = re.match(r"(\w+):\s*(\d+)", line)
-            if match:
-                period, amount = match.groups()
-                if "30" in period:
-                    rates["rate_30min"] = int(amount)
-                elif "1" in period:
-                    rates["rate_1hr"] = int(amount)
-                elif "2" in period:
-                    rates["rate_2hr"] = int(amount)
-                elif "3" in period:
-                    rates["rate_3hr"] = int(amount)
-                elif "over" in period.lower():
-                    rates["rate_overnight"] = int(amount)
-        
-        if rates:
-            db.update_provider_profile(user.id, rates)
-            await update.message.reply_text(
-                "✅ *Rates Updated!*\n\nYour new rates have been saved.",
-                parse_mode="Markdown"
-            )
-        else:
-            await update.message.reply_text("⚠️ Could not parse rates. Use format:\n`30min: 3000`\n`1hr: 5000`", parse_mode="Markdown")
-            return
+    edit_handler = _EDIT_HANDLERS.get(editing)
+    if edit_handler and not await edit_handler(update, context, user.id, text):
+        return  # Still editing (invalid input or multi-step section)
     
     context.user_data.pop("editing", None)
     provider = db.get_provider(user.id)
@@ -941,7 +990,9 @@ def register_handlers(application):
         pattern="^edit_cancel$"
     ))
     
+    # Only users mid-edit reach handle_edit_input; every other text message
+    # falls through to the remaining group-0 handlers (e.g. safety input).
     application.add_handler(MessageHandler(
-        filters.TEXT & ~filters.COMMAND,
+        filters.TEXT & ~filters.COMMAND & UserDataFlagFilter(application.user_data, "editing"),
         handle_edit_input
     ), group=0)
@@ -0,0 +1,47 @@
+"""
+Blackbook Bot - Provider Row Cache
+Short-lived in-process cache for provider rows read by the verification
+flow, so a submission and the admin click that follows it do not each
+re-read the same row.
+"""
+import threading
+import time
+
+from db_context import get_db
+
+PROVIDER_CACHE_TTL_SECONDS = 30
+PROVIDER_CACHE_MAX_SIZE = 2_000
+
+# telegram_id -> (expires_at, provider); dict insertion order doubles as eviction order
+_cache: dict[int, tuple[float, dict]] = {}
+_lock = threading.Lock()
+
+
+def remember_provider(provider_id: int, provider: dict | None) -> None:
+    """Stores a freshly-read provider row."""
+    if not provider:
+        return
+    with _lock:
+        _cache.pop(provider_id, None)
+        if len(_cache) >= PROVIDER_CACHE_MAX_SIZE:
+            del _cache[next(iter(_cache))]
+        _cache[provider_id] = (time.monotonic() + PROVIDER_CACHE_TTL_SECONDS, provider)
+
+
+def cached_get_provider(provider_id: int) -> dict | None:
+    """Returns db.get_provider(provider_id), served from cache while fresh."""
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(provider_id)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    provider = get_db().get_provider(provider_id)
+    remember_provider(provider_id, provider)
+    return provider
+
+
+def invalidate_provider(provider_id: int) -> None:
+    """Drops a provider's cached row. Called after this bot writes to it."""
+    with _lock:
+        _cache.pop(provider_id, None)
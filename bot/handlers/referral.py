@@ -6,11 +6,9 @@ import logging
 from telegram import Update
 from telegram.ext import CallbackQueryHandler, ContextTypes
 
-logger = logging.getLogger(__name__)
+from db_context import get_db
 
-def get_db():
-    from db_context import get_db as _get_db
-    return _get_db()
+logger = logging.getLogger(__name__)
 
 async def referral_reward_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handles the user's choice of referral reward."""
@@ -3,8 +3,10 @@ Blackbook Bot - Safety Handlers
 Handles: check, report, session, checkin, and safety menu callbacks.
 All features are accessible via buttons — no slash commands required.
 """
+import asyncio
 import logging
-from datetime import datetime, timedelta
+import re
+import time
 from telegram import Update
 from telegram.ext import (
     CommandHandler,
@@ -14,40 +16,131 @@ from telegram.ext import (
     filters,
 )
 
-from config import ADMIN_CHAT_ID
+from config import ADMIN_CHAT_ID_INT
+from db_context import get_db
 from utils.keyboards import (
     get_safety_menu_keyboard,
     get_session_duration_keyboard,
     get_session_active_keyboard,
     get_back_button,
     get_safety_input_cancel_keyboard,
+    MAIN_MENU_BUTTONS,
 )
+from utils.filters import UserDataFlagFilter
+from handlers.safety_cache import cached_check_blacklist, invalidate_blacklist_cache
 
 logger = logging.getLogger(__name__)
 
+# user_data keys holding guided check/report input state
+_SAFETY_STATE_KEYS = ("safety_input", "safety_report_phone")
 
-def get_db():
-    """Gets the database instance from db_context module."""
-    from db_context import get_db as _get_db
-    return _get_db()
+_PHONE_STRIP = str.maketrans("", "", " -()\t")
+_PHONE_RE = re.compile(r"\+?[0-9]{9,15}")
 
 
+def _clear_safety_state(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Drops any pending guided check/report input state."""
+    for key in _SAFETY_STATE_KEYS:
+        context.user_data.pop(key, None)
+
+
+def _normalize_phone(text: str) -> str | None:
+    """Strips separators from a phone number; returns None if it is not a valid number."""
+    phone = text.translate(_PHONE_STRIP)
+    return phone if _PHONE_RE.fullmatch(phone) else None
+
+
+def format_check_in_due(minutes: int) -> str:
+    """Returns the local HH:MM wall-clock time a session started now is due."""
+    due = time.localtime(time.time() + minutes * 60)
+    return f"{due.tm_hour:02d}:{due.tm_min:02d}"
+
+
+# ==================== MESSAGE TEXT ====================
+
+_SAFETY_SUITE_MD = (
+    "🛡️ *SAFETY SUITE*\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "Your protection tools:\n\n"
+    "📞 *Check* — Screen client numbers\n"
+    "⏱️ *Session* — Start safety timer\n"
+    "🚫 *Report* — Flag dangerous clients\n"
+    "✅ *Check In* — Confirm you're safe"
+)
+
+_CHECK_PROMPT_MD = (
+    "📞 *CLIENT INTELLIGENCE CHECK*\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "Send the *phone number* you want to check:\n\n"
+    "📱 Example: `0712345678`"
+)
+_CHECK_PROMPT_HINT_MD = (
+    _CHECK_PROMPT_MD + "\n\n"
+    "_We'll search our database for reports of non-payment, "
+    "violence, or suspicious behavior._"
+)
+
+_REPORT_PROMPT_MD = (
+    "🚫 *REPORT A CLIENT*\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "Send the *phone number* of the client to report:\n\n"
+    "📱 Example: `0712345678`"
+)
+_REPORT_PROMPT_HINT_MD = (
+    _REPORT_PROMPT_MD + "\n\n"
+    "_Help protect your sisters. Only report genuine issues._"
+)
+
+_SESSION_PROMPT_MD = (
+    "⏱️ *SAFETY SESSION TIMER*\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "Select session duration:\n\n"
+    "If you don't check in on time, an *Emergency Alert* "
+    "will be sent to the Management Team."
+)
+
+_CHECKIN_OK_MD = (
+    "✅ *CHECK-IN CONFIRMED*\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "Glad you're safe! 💚\n\n"
+    "Remember to start a new session before your next meeting."
+)
+
+_NO_SESSION_MD = (
+    "ℹ️ *No Active Session*\n\n"
+    "You don't have an active safety timer.\n\n"
+    "Use the Safety Suite to start one before your next meeting."
+)
+
+_BLACKLISTED_TEMPLATE = (
+    "🚨 *SECURITY ALERT: BLACKLISTED*\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "📱 Client: `{phone}`\n"
+    "⚠️ Risk: {reason}\n"
+    "📅 Reported: {date}\n\n"
+    "*Recommendation: ABORT CONNECTION. Do not meet this individual.*"
+)
+
+_PASSED_TEMPLATE = (
+    "✅ *Security Check: PASSED*\n\n"
+    "No reports found for `{phone}`.\n\n"
+    "_Always start a ⏱️ Session before meeting a client._"
+)
+
+_INVALID_PHONE_MD = (
+    "⚠️ Invalid phone number. Please send a valid number.\n\n"
+    "📱 Example: `0712345678`"
+)
+
 # ==================== SAFETY MENU (for persistent menu) ====================
 
 async def safety_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Shows the safety suite menu (called from persistent menu buttons)."""
     # Clear any pending safety input state when returning to menu
-    context.user_data.pop("safety_input", None)
-    context.user_data.pop("safety_report_phone", None)
+    _clear_safety_state(context)
 
     await update.message.reply_text(
-        "🛡️ *SAFETY SUITE*\n"
-        "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-        "Your protection tools:\n\n"
-        "📞 *Check* — Screen client numbers\n"
-        "⏱️ *Session* — Start safety timer\n"
-        "🚫 *Report* — Flag dangerous clients\n"
-        "✅ *Check In* — Confirm you're safe",
+        _SAFETY_SUITE_MD,
         reply_markup=get_safety_menu_keyboard(),
         parse_mode="Markdown"
     )
@@ -55,116 +148,153 @@ async def safety_menu(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 
 # ==================== MENU CALLBACKS ====================
 
+async def _edit_if_changed(query, text: str, reply_markup=None) -> None:
+    """
+    Edits the callback message as Markdown, skipping the API call when the
+    message already shows this exact text and keyboard (e.g. repeated taps).
+    """
+    message = query.message
+    try:
+        unchanged = message.text_markdown == text and message.reply_markup == reply_markup
+    except (AttributeError, ValueError):
+        unchanged = False  # Inaccessible message or entities Markdown v1 cannot express
+    if unchanged:
+        return
+    await query.edit_message_text(text, reply_markup=reply_markup, parse_mode="Markdown")
+
+
+async def _show_safety_menu(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Shows the safety suite menu, dropping any pending safety input."""
+    _clear_safety_state(context)
+    
+    await _edit_if_changed(
+        query,
+        _SAFETY_SUITE_MD,
+        reply_markup=get_safety_menu_keyboard()
+    )
+
+
+async def _prompt_check(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Starts the guided number-check flow."""
+    context.user_data["safety_input"] = "check"
+    
+    await _edit_if_changed(
+        query,
+        _CHECK_PROMPT_HINT_MD,
+        reply_markup=get_safety_input_cancel_keyboard()
+    )
+
+
+async def _prompt_session(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Shows the session duration picker."""
+    await _edit_if_changed(
+        query,
+        _SESSION_PROMPT_MD,
+        reply_markup=get_session_duration_keyboard()
+    )
+
+
+async def _start_session_from_callback(query, minutes: int, user_id: int, db) -> None:
+    """Starts a safety session for the selected duration."""
+    session_id = await asyncio.to_thread(db.start_session, user_id, minutes)
+    
+    if session_id:
+        await _edit_if_changed(
+            query,
+            "✅ *SAFETY TIMER ACTIVE*\n"
+            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+            f"⏱️ Duration: {minutes} Minutes\n"
+            f"⏰ Check-in Due: {format_check_in_due(minutes)}\n"
+            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+            "We are watching the clock.\n\n"
+            "Tap *Check In Now* when you're safe.",
+            reply_markup=get_session_active_keyboard()
+        )
+
+
+async def _do_checkin(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Ends the active safety session, if any."""
+    success = await asyncio.to_thread(get_db().end_session, query.from_user.id)
+    
+    await _edit_if_changed(
+        query,
+        _CHECKIN_OK_MD if success else _NO_SESSION_MD,
+        reply_markup=get_back_button()
+    )
+
+
+async def _prompt_report(query, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Starts the guided report flow."""
+    context.user_data["safety_input"] = "report_phone"
+    
+    await _edit_if_changed(
+        query,
+        _REPORT_PROMPT_HINT_MD,
+        reply_markup=get_safety_input_cancel_keyboard()
+    )
+
+
+_ACTION_HANDLERS = {
+    "safety": _show_safety_menu,
+    "safety_check": _prompt_check,
+    "safety_session": _prompt_session,
+    "safety_checkin": _do_checkin,
+    "safety_report": _prompt_report,
+}
+
+
 async def safety_menu_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Handles safety-related menu callbacks."""
     query = update.callback_query
     await query.answer()
     
-    user = query.from_user
     action = query.data.replace("menu_", "")
-    db = get_db()
-    provider = db.get_provider(user.id)
-    
-    # === SAFETY SUITE MENU ===
-    if action == "safety":
-        # Clear any pending safety input state
-        context.user_data.pop("safety_input", None)
-        context.user_data.pop("safety_report_phone", None)
-        
-        await query.edit_message_text(
-            "🛡️ *SAFETY SUITE*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "Your protection tools:\n\n"
-            "📞 *Check* — Screen client numbers\n"
-            "⏱️ *Session* — Start safety timer\n"
-            "🚫 *Report* — Flag dangerous clients\n"
-            "✅ *Check In* — Confirm you're safe",
-            reply_markup=get_safety_menu_keyboard(),
-            parse_mode="Markdown"
-        )
-    
-    # === SAFETY: CHECK NUMBER (guided flow) ===
-    elif action == "safety_check":
-        context.user_data["safety_input"] = "check"
-        
-        await query.edit_message_text(
-            "📞 *CLIENT INTELLIGENCE CHECK*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "Send the *phone number* you want to check:\n\n"
-            "📱 Example: `0712345678`\n\n"
-            "_We'll search our database for reports of non-payment, "
-            "violence, or suspicious behavior._",
-            reply_markup=get_safety_input_cancel_keyboard(),
-            parse_mode="Markdown"
-        )
-    
-    # === SAFETY: START SESSION ===
-    elif action == "safety_session":
-        await query.edit_message_text(
-            "⏱️ *SAFETY SESSION TIMER*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "Select session duration:\n\n"
-            "If you don't check in on time, an *Emergency Alert* "
-            "will be sent to the Management Team.",
-            reply_markup=get_session_duration_keyboard(),
-            parse_mode="Markdown"
+
+    # Session duration buttons carry the minutes in the action: session_<minutes>
+    if action.startswith("session_"):
+        await _start_session_from_callback(query, int(action[len("session_"):]), query.from_user.id, get_db())
+        return
+
+    handler = _ACTION_HANDLERS.get(action)
+    if handler:
+        await handler(query, context)
+
+
+async def _send_blacklist_result(send, user_id: int, phone: str, result: dict) -> None:
+    """Replies with the blacklist verdict for a checked number and logs the check."""
+    if result.get("blacklisted"):
+        text = _BLACKLISTED_TEMPLATE.format(
+            phone=phone,
+            reason=result.get("reason", "Not specified"),
+            date=result.get("date", "Unknown"),
         )
+    else:
+        text = _PASSED_TEMPLATE.format(phone=phone)
     
-    # === SAFETY: SESSION DURATION SELECTED ===
-    elif action.startswith("session_"):
-        minutes = int(action.replace("session_", ""))
-        session_id = db.start_session(user.id, minutes)
-        
-        if session_id:
-            check_back_time = datetime.now() + timedelta(minutes=minutes)
-            
-            await query.edit_message_text(
-                "✅ *SAFETY TIMER ACTIVE*\n"
-                "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-                f"⏱️ Duration: {minutes} Minutes\n"
-                f"⏰ Check-in Due: {check_back_time.strftime('%H:%M')}\n"
-                "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-                "We are watching the clock.\n\n"
-                "Tap *Check In Now* when you're safe.",
-                reply_markup=get_session_active_keyboard(),
-                parse_mode="Markdown"
-            )
-    
-    # === SAFETY: CHECK IN ===
-    elif action == "safety_checkin":
-        success = db.end_session(user.id)
-        
-        if success:
-            await query.edit_message_text(
-                "✅ *CHECK-IN CONFIRMED*\n"
-                "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-                "Glad you're safe! 💚\n\n"
-                "Remember to start a new session before your next meeting.",
-                reply_markup=get_back_button(),
-                parse_mode="Markdown"
-            )
-        else:
-            await query.edit_message_text(
-                "ℹ️ *No Active Session*\n\n"
-                "You don't have an active safety timer.\n\n"
-                "Use the Safety Suite to start one before your next meeting.",
-                reply_markup=get_back_button(),
-                parse_mode="Markdown"
-            )
-    
-    # === SAFETY: REPORT (guided flow) ===
-    elif action == "safety_report":
-        context.user_data["safety_input"] = "report_phone"
-        
-        await query.edit_message_text(
-            "🚫 *REPORT A CLIENT*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "Send the *phone number* of the client to report:\n\n"
-            "📱 Example: `0712345678`\n\n"
-            "_Help protect your sisters. Only report genuine issues._",
-            reply_markup=get_safety_input_cancel_keyboard(),
+    await send(text, reply_markup=get_back_button("menu_safety"), parse_mode="Markdown")
+    logger.info(f"🔍 Blacklist check by {user_id}: {phone} - {'FOUND' if result.get('blacklisted') else 'CLEAR'}")
+
+
+async def _alert_admin_blacklist_report(
+    context: ContextTypes.DEFAULT_TYPE,
+    reporter_id: int,
+    phone: str,
+    reason: str,
+) -> None:
+    """Notifies the admin chat about a new blacklist report."""
+    try:
+        provider = await asyncio.to_thread(get_db().get_provider, reporter_id)
+        name = provider.get("display_name", "Unknown") if provider else "Unknown"
+        await context.bot.send_message(
+            chat_id=ADMIN_CHAT_ID_INT,
+            text=f"🚨 *New Blacklist Report*\n\n"
+                 f"📱 Number: `{phone}`\n"
+                 f"📝 Reason: {reason}\n"
+                 f"👤 Reported by: {name}",
             parse_mode="Markdown"
         )
+    except Exception as e:
+        logger.error(f"Failed to alert admin: {e}")
 
 
 # ==================== GUIDED INPUT HANDLER ====================
@@ -181,64 +311,35 @@ async def handle_safety_input(update: Update, context: ContextTypes.DEFAULT_TYPE
     text = update.message.text.strip()
     
     # Skip if it's a menu button press
-    menu_buttons = [
-        "👑 The Collection", "👤 My Profile", "💰 Top up Balance",
-        "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules"
-    ]
-    if text in menu_buttons:
-        context.user_data.pop("safety_input", None)
-        context.user_data.pop("safety_report_phone", None)
+    if text in MAIN_MENU_BUTTONS:
+        _clear_safety_state(context)
         return  # Let menu handler process it
     
     # === CHECK NUMBER ===
     if safety_action == "check":
-        context.user_data.pop("safety_input", None)
+        phone = _normalize_phone(text)
         
-        phone = text.replace(" ", "").replace("-", "")
-        
-        # Basic validation
-        if len(phone) < 9 or not phone.replace("+", "").isdigit():
+        if phone is None:
             await update.message.reply_text(
-                "⚠️ Invalid phone number. Please send a valid number.\n\n"
-                "📱 Example: `0712345678`",
+                _INVALID_PHONE_MD,
                 reply_markup=get_safety_input_cancel_keyboard(),
                 parse_mode="Markdown"
             )
-            context.user_data["safety_input"] = "check"  # Keep in check mode
-            return
+            return  # Stay in check mode
         
-        result = db.check_blacklist(phone)
+        _clear_safety_state(context)
         
-        if result.get("blacklisted"):
-            await update.message.reply_text(
-                "🚨 *SECURITY ALERT: BLACKLISTED*\n"
-                "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-                f"📱 Client: `{phone}`\n"
-                f"⚠️ Risk: {result.get('reason', 'Not specified')}\n"
-                f"📅 Reported: {result.get('date', 'Unknown')}\n\n"
-                "*Recommendation: ABORT CONNECTION. Do not meet this individual.*",
-                reply_markup=get_back_button("menu_safety"),
-                parse_mode="Markdown"
-            )
-        else:
-            await update.message.reply_text(
-                "✅ *Security Check: PASSED*\n\n"
-                f"No reports found for `{phone}`.\n\n"
-                "_Always start a ⏱️ Session before meeting a client._",
-                reply_markup=get_back_button("menu_safety"),
-                parse_mode="Markdown"
-            )
+        result = await asyncio.to_thread(cached_check_blacklist, phone)
         
-        logger.info(f"🔍 Blacklist check by {user.id}: {phone} - {'FOUND' if result.get('blacklisted') else 'CLEAR'}")
+        await _send_blacklist_result(update.message.reply_text, user.id, phone, result)
     
     # === REPORT: STEP 1 — PHONE NUMBER ===
     elif safety_action == "report_phone":
-        phone = text.replace(" ", "").replace("-", "")
+        phone = _normalize_phone(text)
         
-        if len(phone) < 9 or not phone.replace("+", "").isdigit():
+        if phone is None:
             await update.message.reply_text(
-                "⚠️ Invalid phone number. Please send a valid number.\n\n"
-                "📱 Example: `0712345678`",
+                _INVALID_PHONE_MD,
                 reply_markup=get_safety_input_cancel_keyboard(),
                 parse_mode="Markdown"
             )
@@ -262,24 +363,21 @@ async def handle_safety_input(update: Update, context: ContextTypes.DEFAULT_TYPE
         phone = context.user_data.get("safety_report_phone", "")
         reason = text
         
-        # Clean up state
-        context.user_data.pop("safety_input", None)
-        context.user_data.pop("safety_report_phone", None)
-        
         if len(reason) < 3:
             await update.message.reply_text(
                 "⚠️ Please provide a more detailed reason.",
                 reply_markup=get_safety_input_cancel_keyboard(),
                 parse_mode="Markdown"
             )
-            context.user_data["safety_input"] = "report_reason"
-            context.user_data["safety_report_phone"] = phone
-            return
+            return  # Stay in report_reason mode
         
-        success = db.add_to_blacklist(phone, reason, user.id)
+        _clear_safety_state(context)
+        
+        success = await asyncio.to_thread(db.add_to_blacklist, phone, reason, user.id)
         
         if success:
-            await update.message.reply_text(
+            invalidate_blacklist_cache()
+            confirmation = update.message.reply_text(
                 "✅ *Number Reported*\n"
                 "━━━━━━━━━━━━━━━━━━━━━━\n\n"
                 f"📱 `{phone}` has been added to the blacklist.\n"
@@ -289,21 +387,14 @@ async def handle_safety_input(update: Update, context: ContextTypes.DEFAULT_TYPE
                 parse_mode="Markdown"
             )
             
-            # Alert admin
-            if ADMIN_CHAT_ID:
-                try:
-                    provider = db.get_provider(user.id)
-                    name = provider.get("display_name", "Unknown") if provider else "Unknown"
-                    await context.bot.send_message(
-                        chat_id=int(ADMIN_CHAT_ID),
-                        text=f"🚨 *New Blacklist Report*\n\n"
-                             f"📱 Number: `{phone}`\n"
-                             f"📝 Reason: {reason}\n"
-                             f"👤 Reported by: {name}",
-                        parse_mode="Markdown"
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to alert admin: {e}")
+            # Confirm to the provider and alert admin concurrently
+            if ADMIN_CHAT_ID_INT is not None:
+                await asyncio.gather(
+                    confirmation,
+                    _alert_admin_blacklist_report(context, user.id, phone, reason),
+                )
+            else:
+                await confirmation
         else:
             await update.message.reply_text(
                 "❌ Failed to add to blacklist. Please try again.",
@@ -320,7 +411,7 @@ async def check_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     user = update.effective_user
     db = get_db()
     
-    provider = db.get_provider(user.id)
+    provider = await asyncio.to_thread(db.get_provider, user.id)
     if not provider:
         await update.message.reply_text(
             "❌ You're not registered yet. Tap 👤 My Profile to get started.",
@@ -332,39 +423,16 @@ async def check_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         # No args — start the guided flow instead
         context.user_data["safety_input"] = "check"
         await update.message.reply_text(
-            "📞 *CLIENT INTELLIGENCE CHECK*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "Send the *phone number* you want to check:\n\n"
-            "📱 Example: `0712345678`",
+            _CHECK_PROMPT_MD,
             reply_markup=get_safety_input_cancel_keyboard(),
             parse_mode="Markdown"
         )
         return
     
     phone = context.args[0]
-    result = db.check_blacklist(phone)
+    result = await asyncio.to_thread(cached_check_blacklist, phone)
     
-    if result.get("blacklisted"):
-        await update.message.reply_text(
-            "🚨 *SECURITY ALERT: BLACKLISTED*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            f"📱 Client: `{phone}`\n"
-            f"⚠️ Risk: {result.get('reason', 'Not specified')}\n"
-            f"📅 Reported: {result.get('date', 'Unknown')}\n\n"
-            "*Recommendation: ABORT CONNECTION. Do not meet this individual.*",
-            reply_markup=get_back_button("menu_safety"),
-            parse_mode="Markdown"
-        )
-    else:
-        await update.message.reply_text(
-            "✅ *Security Check: PASSED*\n\n"
-            f"No reports found for `{phone}`.\n\n"
-            "_Always start a ⏱️ Session before meeting a client._",
-            reply_markup=get_back_button("menu_safety"),
-            parse_mode="Markdown"
-        )
-    
-    logger.info(f"🔍 Blacklist check by {user.id}: {phone} - {'FOUND' if result.get('blacklisted') else 'CLEAR'}")
+    await _send_blacklist_result(update.message.reply_text, user.id, phone, result)
 
 
 async def report_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -376,10 +444,7 @@ async def report_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         # No args — start the guided flow instead
         context.user_data["safety_input"] = "report_phone"
         await update.message.reply_text(
-            "🚫 *REPORT A CLIENT*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "Send the *phone number* of the client to report:\n\n"
-            "📱 Example: `0712345678`",
+            _REPORT_PROMPT_MD,
             reply_markup=get_safety_input_cancel_keyboard(),
             parse_mode="Markdown"
         )
@@ -388,10 +453,11 @@ async def report_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     phone = context.args[0]
     reason = " ".join(context.args[1:])
     
-    success = db.add_to_blacklist(phone, reason, user.id)
+    success = await asyncio.to_thread(db.add_to_blacklist, phone, reason, user.id)
     
     if success:
-        await update.message.reply_text(
+        invalidate_blacklist_cache()
+        confirmation = update.message.reply_text(
             "✅ *Number Reported*\n\n"
             f"📱 `{phone}` has been added to the blacklist.\n"
             f"📝 Reason: {reason}\n\n"
@@ -400,21 +466,14 @@ async def report_number(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
             parse_mode="Markdown"
         )
         
-        # Alert admin
-        if ADMIN_CHAT_ID:
-            try:
-                provider = db.get_provider(user.id)
-                name = provider.get("display_name", "Unknown") if provider else "Unknown"
-                await context.bot.send_message(
-                    chat_id=int(ADMIN_CHAT_ID),
-                    text=f"🚨 *New Blacklist Report*\n\n"
-                         f"📱 Number: `{phone}`\n"
-                         f"📝 Reason: {reason}\n"
-                         f"👤 Reported by: {name}",
-                    parse_mode="Markdown"
-                )
-            except Exception as e:
-                logger.error(f"Failed to alert admin: {e}")
+        # Confirm to the provider and alert admin concurrently
+        if ADMIN_CHAT_ID_INT is not None:
+            await asyncio.gather(
+                confirmation,
+                _alert_admin_blacklist_report(context, user.id, phone, reason),
+            )
+        else:
+            await confirmation
     else:
         await update.message.reply_text(
             "❌ Failed to add to blacklist. Please try again.",
@@ -428,7 +487,7 @@ async def start_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     user = update.effective_user
     db = get_db()
     
-    provider = db.get_provider(user.id)
+    provider = await asyncio.to_thread(db.get_provider, user.id)
     if not provider:
         await update.message.reply_text(
             "❌ You're not registered yet. Tap 👤 My Profile to get started."
@@ -438,11 +497,7 @@ async def start_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
     if not context.args or len(context.args) < 1:
         # No args — show duration buttons instead
         await update.message.reply_text(
-            "⏱️ *SAFETY SESSION TIMER*\n"
-            "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-            "Select session duration:\n\n"
-            "If you don't check in on time, an *Emergency Alert* "
-            "will be sent to the Management Team.",
+            _SESSION_PROMPT_MD,
             reply_markup=get_session_duration_keyboard(),
             parse_mode="Markdown"
         )
@@ -460,16 +515,14 @@ async def start_session(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
         await update.message.reply_text("❌ Please enter a valid number of minutes.")
         return
     
-    session_id = db.start_session(user.id, minutes)
+    session_id = await asyncio.to_thread(db.start_session, user.id, minutes)
     
     if session_id:
-        check_back_time = datetime.now() + timedelta(minutes=minutes)
-        
         await update.message.reply_text(
             "✅ *Safety Timer Active.*\n"
             "━━━━━━━━━━━━━━━━━━━━━━\n\n"
             f"⏱️ Duration: {minutes} Minutes\n"
-            f"⏰ Check-in Due: {check_back_time.strftime('%H:%M')}\n"
+            f"⏰ Check-in Due: {format_check_in_due(minutes)}\n"
             "━━━━━━━━━━━━━━━━━━━━━━\n\n"
             "We are watching the clock.\n\n"
             "Tap ✅ *Check In* in the 🛡️ Safety Suite when you're done.",
@@ -485,7 +538,7 @@ async def checkin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     user = update.effective_user
     db = get_db()
     
-    success = db.end_session(user.id)
+    success = await asyncio.to_thread(db.end_session, user.id)
     
     if success:
         await update.message.reply_text(
@@ -516,11 +569,12 @@ def register_handlers(application):
     # Menu callback handler
     application.add_handler(CallbackQueryHandler(
         safety_menu_callback,
-        pattern="^menu_(safety|safety_check|safety_session|safety_checkin|safety_report|session_\\d+)$"
+        pattern=r"^menu_(?:safety(?:_(?:check|checkin|session|report))?|session_\d+)$"
     ))
     
-    # Safety input handler (check/report guided flows)
+    # Safety input handler (check/report guided flows). Only users mid-flow are
+    # dispatched here; menu-button presses still reach it so the flow is exited.
     application.add_handler(MessageHandler(
-        filters.TEXT & ~filters.COMMAND,
+        filters.TEXT & ~filters.COMMAND & UserDataFlagFilter(application.user_data, "safety_input"),
         handle_safety_input
     ), group=0)
@@ -0,0 +1,50 @@
+"""
+Blackbook Bot - Safety Lookup Cache
+Short-lived in-process cache for blacklist checks so repeated lookups of the
+same number do not hit the database every time.
+"""
+import threading
+import time
+
+from db_context import get_db
+
+BLACKLIST_CACHE_TTL_SECONDS = 300
+# "Not blacklisted" answers expire sooner: the web portal also writes reports,
+# and those do not invalidate this process's cache.
+BLACKLIST_CACHE_CLEAR_TTL_SECONDS = 60
+BLACKLIST_CACHE_MAX_SIZE = 10_000
+
+# phone -> (expires_at, result); dict insertion order doubles as eviction order
+_cache: dict[str, tuple[float, dict]] = {}
+_lock = threading.Lock()
+
+
+def cached_check_blacklist(phone: str) -> dict:
+    """Returns db.check_blacklist(phone), served from cache while fresh."""
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(phone)
+        if entry and entry[0] > now:
+            return entry[1]
+
+    result = get_db().check_blacklist(phone)
+    if "error" in result:
+        return result  # Never cache a failed lookup
+
+    with _lock:
+        _cache.pop(phone, None)
+        if len(_cache) >= BLACKLIST_CACHE_MAX_SIZE:
+            del _cache[next(iter(_cache))]
+        ttl = BLACKLIST_CACHE_TTL_SECONDS if result.get("blacklisted") else BLACKLIST_CACHE_CLEAR_TTL_SECONDS
+        _cache[phone] = (now + ttl, result)
+    return result
+
+
+def invalidate_blacklist_cache() -> None:
+    """
+    Drops all cached lookups. Called after a new report is stored.
+    The whole cache is cleared because one stored number can match several
+    input spellings (e.g. 07... vs 2547...).
+    """
+    with _lock:
+        _cache.clear()
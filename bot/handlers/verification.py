@@ -1,12 +1,16 @@
+import asyncio
 import logging
 import os
+import re
+from functools import lru_cache
+from types import MappingProxyType
 from urllib.parse import quote
 import httpx
-from telegram import Update, InlineKeyboardMarkup, InlineKeyboardButton
+from telegram import Bot, Update, InlineKeyboardMarkup, InlineKeyboardButton
 from telegram.ext import ContextTypes, ConversationHandler
 
 from config import (
-    ADMIN_CHAT_ID,
+    ADMIN_CHAT_ID_INT,
     ADMIN_BOT_TOKEN,
     TELEGRAM_TOKEN,
     AWAITING_PHOTO,
@@ -14,16 +18,141 @@ from config import (
     FREE_TRIAL_DAYS,
 )
 from db_context import get_db
+from handlers.provider_cache import cached_get_provider, invalidate_provider, remember_provider
+from utils.http_client import dumps_json, get_http_client, post_json
 from utils.keyboards import get_admin_verification_keyboard
 
 logger = logging.getLogger(__name__)
 
+_PUBLIC_WEB_BASE_URL = os.getenv("PUBLIC_WEB_BASE_URL", "https://innbucks.org").rstrip("/")
+
+# Same token: the client bot can post the photo itself and handle the callbacks.
+_SAME_TOKEN = ADMIN_BOT_TOKEN == TELEGRAM_TOKEN
+
+# Extra attempts for admin notifications on network errors / 5xx; a duplicate
+# admin post is harmless, a lost one stalls the provider's verification.
+ADMIN_SEND_RETRIES = 2
+
+# verify_<action>_<provider_id>[_<reason_code>]
+_CALLBACK_RE = re.compile(r"verify_(approve|reject)_(\d+)(?:_(\w+))?")
+
+REJECT_REASONS = MappingProxyType({
+    "photo": "photo quality issue",
+    "mismatch": "identity mismatch",
+    "incomplete": "incomplete profile details",
+    "generic": "verification requirements not met",
+})
+
+_PENDING_MD = (
+    "⏳ *Verification Pending*\n\n"
+    "Your profile is already awaiting admin approval.\n"
+    "You will be notified once approved."
+)
+_ADMIN_CAPTION_TEMPLATE = (
+    "🔍 *NEW VERIFICATION REQUEST*\n"
+    "━━━━━━━━━━━━━━━\n"
+    "👤 Provider: {display_name}\n"
+    "📍 City: {city}\n"
+    "🆔 User ID: `{user_id}`\n"
+)
+_APPROVED_LIVE_MD = (
+    "🎉 *VERIFIED! You're Now Live!*\n\n"
+    "✅ Blue Tick status granted\n"
+    "✅ Profile is active on innbucks.org\n\n"
+    "Your profile is now visible to premium clients!\n\n"
+    "🌐 View your listing at: *https://innbucks.org*"
+)
+_APPROVED_INACTIVE_MD = (
+    "✅ *Verification Approved!*\n\n"
+    "🎉 You now have the Blue Tick ✔️\n\n"
+    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
+    "📋 *Your profile is saved but not yet live.*\n\n"
+    f"🎁 You can start a *{FREE_TRIAL_DAYS}-day free trial* once,\n"
+    "or activate a paid package immediately.\n\n"
+    "💡 Once activated, your profile goes live instantly!"
+)
+_REJECTED_PROVIDER_TEMPLATE = (
+    "❌ **Verification Rejected**\n\n"
+    "Reason: **{reason}**\n\n"
+    "Please tap 📸 Get Verified in your profile to submit a corrected photo/profile and try again."
+)
+_APPROVED_ADMIN_TEMPLATE = (
+    "✅ **APPROVED**\n\n"
+    "Provider: {display_name}\n"
+    "User ID: `{provider_id}`"
+)
+_REJECTED_ADMIN_TEMPLATE = (
+    "❌ **REJECTED**\n\n"
+    "Provider: {display_name}\n"
+    "User ID: `{provider_id}`\n"
+    "Reason: {reason}"
+)
+
 def is_verification_pending(provider: dict) -> bool:
     """Returns True when provider has submitted verification and is awaiting admin action."""
     if not provider:
         return False
     return bool(provider.get("verification_photo_id")) and not bool(provider.get("is_verified"))
 
+def _public_photo_url(photo_ref: str) -> str:
+    """URL the admin bot can fetch a photo from; client-bot file_ids go via the web proxy."""
+    if photo_ref.startswith(("http://", "https://")):
+        return photo_ref
+    return f"{_PUBLIC_WEB_BASE_URL}/photo/{quote(photo_ref, safe='')}"
+
+def _serialize_keyboard(markup: InlineKeyboardMarkup) -> dict:
+    """Converts an inline keyboard into the raw Bot API reply_markup shape."""
+    return {
+        "inline_keyboard": [
+            [
+                {
+                    "text": button.text,
+                    "callback_data": button.callback_data,
+                }
+                for button in row
+            ]
+            for row in markup.inline_keyboard
+        ]
+    }
+
+@lru_cache(maxsize=1024)
+def _admin_keyboard_payload(provider_id: int) -> dict:
+    """Serialized admin verification keyboard for a provider. Treat as read-only."""
+    return _serialize_keyboard(get_admin_verification_keyboard(provider_id))
+
+async def _upload_admin_photo(
+    context: ContextTypes.DEFAULT_TYPE,
+    photo_file_id: str,
+    caption: str,
+    reply_markup: dict,
+) -> "httpx.Response | None":
+    """Uploads a client-bot photo to the admin bot. Returns None unless the upload succeeded."""
+    try:
+        tg_file = await context.bot.get_file(photo_file_id)
+        photo_bytes = await tg_file.download_as_bytearray()
+    except Exception as e:
+        logger.warning("⚠️ Could not download verification photo for admin upload: %s", e)
+        return None
+
+    try:
+        resp = await get_http_client().post(
+            f"https://api.telegram.org/bot{ADMIN_BOT_TOKEN}/sendPhoto",
+            data={
+                "chat_id": str(ADMIN_CHAT_ID_INT),
+                "caption": caption,
+                "parse_mode": "Markdown",
+                "reply_markup": dumps_json(reply_markup).decode("utf-8"),
+            },
+            files={"photo": ("verification.jpg", bytes(photo_bytes), "image/jpeg")},
+        )
+    except httpx.TransportError as e:
+        logger.warning("⚠️ Admin photo upload failed, falling back to the proxy URL: %s", e)
+        return None
+    if resp.status_code != 200:
+        logger.warning("⚠️ Admin photo upload rejected (%s), falling back to the proxy URL: %s", resp.status_code, resp.text)
+        return None
+    return resp
+
 async def send_admin_verification_request(
     context: ContextTypes.DEFAULT_TYPE,
     provider_id: int,
@@ -31,16 +160,16 @@ async def send_admin_verification_request(
     caption: str,
 ) -> bool:
     """
-    Sends verification request to admin chat.
-    If admin bot token matches client bot token, include inline approve/reject buttons.
-    If different token is used, send notification-only message to avoid dead callback buttons.
+    Sends verification request to admin chat with inline approve/reject buttons.
+    With a separate admin bot token the message is posted by the admin bot, whose
+    BOT_ROLE=admin process handles those callbacks (register_admin_verification_handlers).
     """
-    if not ADMIN_CHAT_ID:
+    if ADMIN_CHAT_ID_INT is None:
         return False
 
-    if ADMIN_BOT_TOKEN == TELEGRAM_TOKEN:
+    if _SAME_TOKEN:
         await context.bot.send_photo(
-            chat_id=int(ADMIN_CHAT_ID),
+            chat_id=ADMIN_CHAT_ID_INT,
             photo=photo_file_id,
             caption=caption,
             reply_markup=get_admin_verification_keyboard(provider_id),
@@ -49,51 +178,42 @@ async def send_admin_verification_request(
         return True
 
     # Different admin bot token: file_id from client bot cannot be reused directly.
-    # Send a publicly reachable photo URL through the web proxy endpoint.
-    public_base_url = os.getenv("PUBLIC_WEB_BASE_URL", "https://innbucks.org").rstrip("/")
-    photo_ref = photo_file_id
+    # Upload the bytes fetched by the client bot; the web photo proxy URL is the fallback.
+    resp = None
+    reply_markup = _admin_keyboard_payload(provider_id)
     if not photo_file_id.startswith(("http://", "https://")):
-        photo_ref = f"{public_base_url}/photo/{quote(photo_file_id, safe='')}"
+        resp = await _upload_admin_photo(context, photo_file_id, caption, reply_markup)
 
-    keyboard = get_admin_verification_keyboard(provider_id)
-    reply_markup = {
-        "inline_keyboard": [
-            [
-                {
-                    "text": button.text,
-                    "callback_data": button.callback_data,
-                }
-                for button in row
-            ]
-            for row in keyboard.inline_keyboard
-        ]
-    }
-    url = f"https://api.telegram.org/bot{ADMIN_BOT_TOKEN}/sendPhoto"
-    payload = {
-        "chat_id": int(ADMIN_CHAT_ID),
-        "photo": photo_ref,
-        "caption": caption,
-        "parse_mode": "Markdown",
-        "reply_markup": reply_markup,
-    }
-    async with httpx.AsyncClient(timeout=20.0) as client:
-        resp = await client.post(url, json=payload)
-        if resp.status_code != 200:
-            logger.error(f"❌ Failed to send admin verification photo notification: {resp.text}")
-            # Fallback to plain text notification so moderation still proceeds.
-            fallback_payload = {
-                "chat_id": int(ADMIN_CHAT_ID),
-                "text": f"{caption}\n\nPhoto URL:\n{photo_ref}",
-                "parse_mode": "Markdown",
-                "reply_markup": reply_markup,
-            }
-            resp2 = await client.post(
-                f"https://api.telegram.org/bot{ADMIN_BOT_TOKEN}/sendMessage",
-                json=fallback_payload,
-            )
-            if resp2.status_code != 200:
-                logger.error(f"❌ Failed to send admin verification fallback notification: {resp2.text}")
-                return False
+    if resp is None:
+        payload = {
+            "chat_id": ADMIN_CHAT_ID_INT,
+            "photo": _public_photo_url(photo_file_id),
+            "caption": caption,
+            "parse_mode": "Markdown",
+            "reply_markup": reply_markup,
+        }
+        resp = await post_json(
+            f"https://api.telegram.org/bot{ADMIN_BOT_TOKEN}/sendPhoto",
+            payload,
+            retries=ADMIN_SEND_RETRIES,
+        )
+    if resp.status_code != 200:
+        logger.error("❌ Failed to send admin verification photo notification: %s", resp.text)
+        # Fallback to plain text notification so moderation still proceeds.
+        fallback_payload = {
+            "chat_id": ADMIN_CHAT_ID_INT,
+            "text": f"{caption}\n\nPhoto URL:\n{_public_photo_url(photo_file_id)}",
+            "parse_mode": "Markdown",
+            "reply_markup": reply_markup,
+        }
+        resp2 = await post_json(
+            f"https://api.telegram.org/bot{ADMIN_BOT_TOKEN}/sendMessage",
+            fallback_payload,
+            retries=ADMIN_SEND_RETRIES,
+        )
+        if resp2.status_code != 200:
+            logger.error("❌ Failed to send admin verification fallback notification: %s", resp2.text)
+            return False
     return True
 
 async def send_provider_message(
@@ -101,8 +221,26 @@ async def send_provider_message(
     text: str,
     parse_mode: str = "Markdown",
     reply_markup: InlineKeyboardMarkup | None = None,
+    bot: Bot | None = None,
 ) -> bool:
-    """Sends provider-facing message via client bot token."""
+    """
+    Sends provider-facing message via client bot token.
+    When `bot` is the client bot itself the message goes through PTB; the
+    dedicated admin bot cannot message providers, so it posts with the client token.
+    """
+    if bot is not None and bot.token == TELEGRAM_TOKEN:
+        try:
+            await bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode=parse_mode,
+                reply_markup=reply_markup,
+            )
+            return True
+        except Exception as e:
+            logger.error("❌ Provider notification error (%s): %s", chat_id, e)
+            return False
+
     if not TELEGRAM_TOKEN:
         logger.error("❌ TELEGRAM_TOKEN missing; cannot notify provider")
         return False
@@ -113,38 +251,55 @@ async def send_provider_message(
         "parse_mode": parse_mode,
     }
     if reply_markup:
-        payload["reply_markup"] = {
-            "inline_keyboard": [
-                [
-                    {
-                        "text": button.text,
-                        "callback_data": button.callback_data,
-                    }
-                    for button in row
-                ]
-                for row in reply_markup.inline_keyboard
-            ]
-        }
+        payload["reply_markup"] = _serialize_keyboard(reply_markup)
 
     url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
     try:
-        async with httpx.AsyncClient(timeout=20.0) as client:
-            resp = await client.post(url, json=payload)
-            if resp.status_code != 200:
-                logger.error(f"❌ Failed provider notification ({chat_id}): {resp.text}")
-                return False
+        resp = await post_json(url, payload)
+        if resp.status_code != 200:
+            logger.error("❌ Failed provider notification (%s): %s", chat_id, resp.text)
+            return False
         return True
     except Exception as e:
-        logger.error(f"❌ Provider notification error ({chat_id}): {e}")
+        logger.error("❌ Provider notification error (%s): %s", chat_id, e)
         return False
 
 
+async def _notify_admin_of_submission(
+    context: ContextTypes.DEFAULT_TYPE,
+    user_id: int,
+    photo_file_id: str,
+    caption: str,
+) -> None:
+    """Queues a verification submission with admins and tells the provider if that fails."""
+    try:
+        sent = await send_admin_verification_request(
+            context=context,
+            provider_id=user_id,
+            photo_file_id=photo_file_id,
+            caption=caption,
+        )
+    except Exception as e:
+        logger.error("❌ Admin verification notification error (%s): %s", user_id, e)
+        sent = False
+
+    if not sent:
+        await context.bot.send_message(
+            chat_id=user_id,
+            text="⚠️ Verification queue notification failed. Please contact support.",
+            parse_mode="Markdown",
+        )
+        return
+    await asyncio.to_thread(get_db().log_funnel_event, user_id, "verification_submitted")
+
+
 async def verify(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Starts the verification process - simple photo upload for manual review."""
     user = update.effective_user
     db = get_db()
     
-    provider = db.get_provider(user.id)
+    provider = await asyncio.to_thread(db.get_provider, user.id)
+    remember_provider(user.id, provider)
     if not provider:
         await update.message.reply_text(
             "❌ You need to /register first before verification.",
@@ -160,12 +315,7 @@ async def verify(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         return ConversationHandler.END
 
     if is_verification_pending(provider):
-        await update.message.reply_text(
-            "⏳ *Verification Pending*\n\n"
-            "Your profile is already awaiting admin approval.\n"
-            "You will be notified once approved.",
-            parse_mode="Markdown",
-        )
+        await update.message.reply_text(_PENDING_MD, parse_mode="Markdown")
         return ConversationHandler.END
     
     await update.message.reply_text(
@@ -175,7 +325,7 @@ async def verify(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         "📷 Send your photo now:",
         parse_mode="Markdown"
     )
-    db.log_funnel_event(user.id, "verification_started")
+    await asyncio.to_thread(db.log_funnel_event, user.id, "verification_started")
     return AWAITING_PHOTO
 
 async def handle_verification_photo(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -194,46 +344,44 @@ async def handle_verification_photo(update: Update, context: ContextTypes.DEFAUL
     photo = update.message.photo[-1]
     photo_file_id = photo.file_id
     
-    provider = db.get_provider(user.id)
+    provider = await asyncio.to_thread(cached_get_provider, user.id)
     display_name = provider.get("display_name", "Unknown") if provider else "Unknown"
+
+    # A submission may already be queued (e.g. from the web portal); don't notify admins twice.
+    if is_verification_pending(provider):
+        await update.message.reply_text(_PENDING_MD, parse_mode="Markdown")
+        context.user_data.clear()
+        return ConversationHandler.END
     
-    db.save_verification_photo(user.id, photo_file_id)
+    await asyncio.to_thread(db.save_verification_photo, user.id, photo_file_id)
+    invalidate_provider(user.id)
     
-    if not ADMIN_CHAT_ID:
+    if ADMIN_CHAT_ID_INT is None:
         logger.error("❌ ADMIN_CHAT_ID not set!")
         await update.message.reply_text(
             "⚠️ Verification system error. Please contact support."
         )
         return ConversationHandler.END
     
-    caption = (
-        "🔍 *NEW VERIFICATION REQUEST*\n"
-        "━━━━━━━━━━━━━━━\n"
-        f"👤 Provider: {display_name}\n"
-        f"📍 City: {provider.get('city', 'N/A') if provider else 'N/A'}\n"
-        f"🆔 User ID: `{user.id}`\n"
+    caption = _ADMIN_CAPTION_TEMPLATE.format(
+        display_name=display_name,
+        city=provider.get("city", "N/A") if provider else "N/A",
+        user_id=user.id,
     )
     
-    sent = await send_admin_verification_request(
-        context=context,
-        provider_id=user.id,
-        photo_file_id=photo_file_id,
-        caption=caption,
-    )
-    if not sent:
-        await update.message.reply_text(
-            "⚠️ Verification queue notification failed. Please contact support.",
-            parse_mode="Markdown",
-        )
-        return ConversationHandler.END
-    db.log_funnel_event(user.id, "verification_submitted")
-    
     await update.message.reply_text(
         "✅ *Photo Uploaded Successfully*\n\n"
         "Your verification is in queue for manual review.\n\n"
         "_Review time: Usually within 2-4 hours._",
         parse_mode="Markdown"
     )
+
+    # The admin notification runs in the background so the provider's ack is
+    # not held up by a second Bot API round-trip.
+    context.application.create_task(
+        _notify_admin_of_submission(context, user.id, photo_file_id, caption),
+        update=update,
+    )
     
     context.user_data.clear()
     return ConversationHandler.END
@@ -259,23 +407,15 @@ async def admin_verification_callback(update: Update, context: ContextTypes.DEFA
         await query.answer("Access denied.", show_alert=True)
         return
     
-    data = query.data
-    parts = data.split("_")
-
-    if len(parts) < 3:
+    match = _CALLBACK_RE.fullmatch(query.data or "")
+    if not match:
         return
     
-    action = parts[1]
-    provider_id = int(parts[2])
-    reason_code = parts[3] if action == "reject" and len(parts) > 3 else "generic"
-    reject_reasons = {
-        "photo": "photo quality issue",
-        "mismatch": "identity mismatch",
-        "incomplete": "incomplete profile details",
-        "generic": "verification requirements not met",
-    }
+    action = match.group(1)
+    provider_id = int(match.group(2))
+    reason_code = (action == "reject" and match.group(3)) or "generic"
     
-    provider = db.get_provider(provider_id)
+    provider = await asyncio.to_thread(cached_get_provider, provider_id)
     if not provider:
         await query.answer("Provider not found.", show_alert=True)
         return
@@ -289,75 +429,69 @@ async def admin_verification_callback(update: Update, context: ContextTypes.DEFA
             await query.edit_message_text(text=text, parse_mode="Markdown")
     
     if action == "approve":
-        updated = db.verify_provider(provider_id, True, admin_tg_id=query.from_user.id)
+        updated = await asyncio.to_thread(db.verify_provider, provider_id, True, admin_tg_id=query.from_user.id)
+        invalidate_provider(provider_id)
         if not updated:
             await query.answer("Approve failed. Please retry.", show_alert=True)
-            logger.error(f"❌ Failed to approve provider {provider_id}; verify_provider returned False")
+            logger.error("❌ Failed to approve provider %s; verify_provider returned False", provider_id)
             return
+        approved_text = _APPROVED_ADMIN_TEMPLATE.format(display_name=display_name, provider_id=provider_id)
+        if is_portal_account:
+            approved_text += "\nType: `portal` (login unlocked)"
+        # Funnel log, provider notice and admin caption edit are independent.
+        pending = [_edit_admin_result(approved_text)]
         if not is_portal_account:
-            db.log_funnel_event(provider_id, "verified")
+            pending.append(asyncio.to_thread(db.log_funnel_event, provider_id, "verified"))
             is_active = provider.get("is_active", False)
             if is_active:
-                await send_provider_message(
-                    chat_id=provider_id,
-                    text="🎉 *VERIFIED! You're Now Live!*\n\n"
-                    "✅ Blue Tick status granted\n"
-                    "✅ Profile is active on innbucks.org\n\n"
-                    "Your profile is now visible to premium clients!\n\n"
-                    "🌐 View your listing at: *https://innbucks.org*",
-                )
+                pending.append(send_provider_message(chat_id=provider_id, text=_APPROVED_LIVE_MD, bot=context.bot))
             else:
-                await send_provider_message(
+                pending.append(send_provider_message(
                     chat_id=provider_id,
-                    text="✅ *Verification Approved!*\n\n"
-                    "🎉 You now have the Blue Tick ✔️\n\n"
-                    "━━━━━━━━━━━━━━━━━━━━━━\n\n"
-                    "📋 *Your profile is saved but not yet live.*\n\n"
-                    f"🎁 You can start a *{FREE_TRIAL_DAYS}-day free trial* once,\n"
-                    "or activate a paid package immediately.\n\n"
-                    "💡 Once activated, your profile goes live instantly!",
+                    text=_APPROVED_INACTIVE_MD,
                     reply_markup=InlineKeyboardMarkup([
                         [InlineKeyboardButton(f"🎁 Start {FREE_TRIAL_DAYS}-Day Free Trial", callback_data="menu_trial_activate")],
                         [InlineKeyboardButton("💰 Choose Paid Package", callback_data="menu_topup")],
                     ]),
-                )
-        approved_text = (
-            f"✅ **APPROVED**\n\n"
-            f"Provider: {display_name}\n"
-            f"User ID: `{provider_id}`"
-        )
-        if is_portal_account:
-            approved_text += "\nType: `portal` (login unlocked)"
-        await _edit_admin_result(approved_text)
-        logger.info(f"✅ Provider {provider_id} ({display_name}) verified by admin")
+                    bot=context.bot,
+                ))
+        await asyncio.gather(*pending)
+        logger.info("✅ Provider %s (%s) verified by admin", provider_id, display_name)
         return
 
     elif action == "reject":
-        reason_text = reject_reasons.get(reason_code, reject_reasons["generic"])
-        updated = db.verify_provider(provider_id, False, admin_tg_id=query.from_user.id, reason=reason_text)
+        reason_text = REJECT_REASONS.get(reason_code, REJECT_REASONS["generic"])
+        updated = await asyncio.to_thread(
+            db.verify_provider, provider_id, False, admin_tg_id=query.from_user.id, reason=reason_text
+        )
+        invalidate_provider(provider_id)
         if not updated:
             await query.answer("Reject failed. Please retry.", show_alert=True)
-            logger.error(f"❌ Failed to reject provider {provider_id}; verify_provider returned False")
+            logger.error("❌ Failed to reject provider %s; verify_provider returned False", provider_id)
             return
-        if not is_portal_account:
-            db.log_funnel_event(provider_id, "verification_rejected", {"reason": reason_text})
-            db.update_provider_profile(provider_id, {"verification_photo_id": None})
-            await send_provider_message(
-                chat_id=provider_id,
-                text="❌ **Verification Rejected**\n\n"
-                     f"Reason: **{reason_text}**\n\n"
-                     "Please tap 📸 Get Verified in your profile to submit a corrected photo/profile and try again.",
-            )
-        rejected_text = (
-            f"❌ **REJECTED**\n\n"
-            f"Provider: {display_name}\n"
-            f"User ID: `{provider_id}`\n"
-            f"Reason: {reason_text}"
+        rejected_text = _REJECTED_ADMIN_TEMPLATE.format(
+            display_name=display_name,
+            provider_id=provider_id,
+            reason=reason_text,
         )
         if is_portal_account:
             rejected_text += "\nType: `portal` (login remains blocked)"
-        await _edit_admin_result(rejected_text)
-        logger.info(f"❌ Provider {provider_id} ({display_name}) rejected by admin")
+        pending = [_edit_admin_result(rejected_text)]
+        if not is_portal_account:
+            # Clear the photo before telling the provider to resubmit, so /verify
+            # no longer reports the old submission as pending.
+            await asyncio.to_thread(db.update_provider_profile, provider_id, {"verification_photo_id": None})
+            invalidate_provider(provider_id)
+            pending.append(asyncio.to_thread(
+                db.log_funnel_event, provider_id, "verification_rejected", {"reason": reason_text}
+            ))
+            pending.append(send_provider_message(
+                chat_id=provider_id,
+                text=_REJECTED_PROVIDER_TEMPLATE.format(reason=reason_text),
+                bot=context.bot,
+            ))
+        await asyncio.gather(*pending)
+        logger.info("❌ Provider %s (%s) rejected by admin", provider_id, display_name)
         return
     else:
         await query.answer("Unknown moderation action.", show_alert=True)
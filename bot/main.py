@@ -2,17 +2,24 @@
 Blackbook Bot - Main Entry Point
 Orchestrates client/admin bot roles with shared database and modular handlers.
 """
+import asyncio
 import os
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
-import httpx
 from telegram import Update
-from telegram.ext import Application, PicklePersistence
+from telegram.error import BadRequest
+from telegram.ext import Application
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover
+    uvloop = None
 
 from config import (
     TELEGRAM_TOKEN,
     ADMIN_CHAT_ID,
+    ADMIN_CHAT_ID_INT,
     ADMIN_BOT_TOKEN,
     FREE_TRIAL_REMINDER_DAY2_HOURS,
     FREE_TRIAL_REMINDER_DAY5_HOURS,
@@ -23,6 +30,9 @@ from database import Database
 from handlers import register_all_handlers, register_admin_only_handlers
 from utils.logger import get_logger, configure_root_logger
 from db_context import set_db
+from utils.http_client import close_http_client, post_json
+from utils.formatters import escape_markdown
+from utils.persistence import CoalescingPicklePersistence
 
 configure_root_logger()
 logger = get_logger(__name__)
@@ -31,17 +41,103 @@ logger = get_logger(__name__)
 def _resolve_role() -> str:
     role = os.getenv("BOT_ROLE", "client").strip().lower()
     if role not in {"client", "admin"}:
-        logger.warning(f"Unknown BOT_ROLE '{role}', defaulting to client")
+        logger.warning("Unknown BOT_ROLE '%s', defaulting to client", role)
         role = "client"
     return role
 
 
+# PTB strips the "Bad Request: " prefix and capitalizes these, so the case is stable
+_BENIGN_BAD_REQUESTS = ("Message is not modified",)
+
+# Telegram allows roughly 30 messages/second per bot across all chats.
+JOB_SEND_CONCURRENCY = 25
+# Shared by every job so overlapping ticks stay inside one budget
+_job_send_slots = asyncio.Semaphore(JOB_SEND_CONCURRENCY)
+
+
+# Job message templates are built once; names are Markdown-escaped before formatting.
+TRIAL_EXPIRED_TEMPLATE = (
+    "? *Free Trial Ended*\n\n"
+    "Hi {name}, your trial has ended and your listing is now paused.\n\n"
+    "To go live again immediately, choose any paid package in ?? Top up Balance."
+)
+TRIAL_WINBACK_TEMPLATE = (
+    "*We can bring you back live today*\n\n"
+    f"Hi {{name}}, it has been about {TRIAL_WINBACK_AFTER_HOURS} hours since your trial ended.\n\n"
+    "Activate any paid package in Top up Balance and we can put your listing back online instantly."
+)
+
+# The escaped name stays outside bold: legacy Markdown shows backslash escapes inside entities literally
+OVERDUE_ALERT_TEMPLATE = (
+    "?? *EMERGENCY: OVERDUE CHECK-IN*\n"
+    "??????????????????????????\n\n"
+    "?? Provider: {name}\n"
+    "?? Phone: `{phone}`\n"
+    "? Expected back: {back}\n\n"
+    "*Provider has NOT checked in!*\n"
+    "Immediate follow-up recommended."
+)
+
+# (reminder_type, log label, message template)
+TRIAL_REMINDERS = (
+    (
+        "lastday",
+        "final",
+        "?? *Trial Ending Soon*\n\n"
+        "Hi {name}, your free trial ends in less than 24 hours.\n\n"
+        "Tap ?? Top up Balance now to keep your listing live with no downtime.",
+    ),
+    (
+        "day5",
+        "day-5",
+        "?? *Trial Reminder*\n\n"
+        "Hi {name}, your free trial is nearing its end.\n\n"
+        "Choose a paid package in ?? Top up Balance to stay visible without interruption.",
+    ),
+    (
+        "day2",
+        "day-2",
+        "?? *Trial Day-2 Check-in*\n\n"
+        "Hi {name}, your listing is now live and clients are already browsing.\n\n"
+        "Quick win: keep photos and rates updated today so you get more responses this week.",
+    ),
+)
+
+
+async def _run_bounded(items, send_one) -> list:
+    """
+    Awaits send_one(item) for every item concurrently, at most JOB_SEND_CONCURRENCY
+    at a time across all jobs. Each slot is held for at least a second, which makes
+    the semaphore a token bucket of ~JOB_SEND_CONCURRENCY sends/s.
+    Results are returned in input order.
+    """
+    loop = asyncio.get_running_loop()
+
+    async def _run(item):
+        async with _job_send_slots:
+            started = loop.time()
+            try:
+                return await send_one(item)
+            finally:
+                remaining = 1.0 - (loop.time() - started)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+
+    return await asyncio.gather(*(_run(item) for item in items))
+
+
 def _default_heartbeat_file(role: str) -> str:
     if role == "admin":
         return "/tmp/blackbook_admin_bot_heartbeat"
     return "/tmp/blackbook_bot_heartbeat"
 
 
+async def _close_http_client(application: Application) -> None:
+    """Releases pooled Bot API connections on shutdown."""
+    _ = application
+    await close_http_client()
+
+
 def main() -> None:
     role = _resolve_role()
     primary_token = ADMIN_BOT_TOKEN if role == "admin" else TELEGRAM_TOKEN
@@ -49,7 +145,7 @@ def main() -> None:
 
     if not primary_token:
         env_name = "ADMIN_BOT_TOKEN" if role == "admin" else "TELEGRAM_TOKEN"
-        logger.error(f"{env_name} environment variable not set")
+        logger.error("%s environment variable not set", env_name)
         raise ValueError(f"{env_name} environment variable is required")
 
     if role == "admin":
@@ -62,6 +158,9 @@ def main() -> None:
 
     if not ADMIN_CHAT_ID:
         logger.warning("ADMIN_CHAT_ID not set; admin alerts disabled")
+    elif ADMIN_CHAT_ID_INT is None:
+        logger.error("ADMIN_CHAT_ID must be a numeric chat id, got '%s'", ADMIN_CHAT_ID)
+        raise ValueError("ADMIN_CHAT_ID must be a numeric chat id")
 
     if role == "client" and ADMIN_BOT_TOKEN and ADMIN_BOT_TOKEN != TELEGRAM_TOKEN:
         logger.info("Separate ADMIN_BOT_TOKEN detected; moderation alerts go to admin bot")
@@ -69,18 +168,22 @@ def main() -> None:
     persistence_file = os.path.join(os.path.dirname(__file__), f"bot_persistence_{role}.pickle")
     heartbeat_file = os.getenv("BOT_HEARTBEAT_FILE", _default_heartbeat_file(role))
 
-    logger.info(f"Starting bot role: {role}")
+    logger.info("Starting bot role: %s", role)
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
     logger.info("Initializing database connection...")
     db = Database()
 
     logger.info("Loading conversation persistence...")
-    persistence = PicklePersistence(filepath=persistence_file)
+    persistence = CoalescingPicklePersistence(filepath=persistence_file)
 
     logger.info("Building Telegram application...")
     application = (
         Application.builder()
         .token(primary_token)
         .persistence(persistence)
+        .post_shutdown(_close_http_client)
         .build()
     )
 
@@ -94,18 +197,22 @@ def main() -> None:
         logger.info("Registering client handlers...")
         register_all_handlers(application, db)
 
+    heartbeat_path = Path(heartbeat_file)
+    try:
+        heartbeat_path.parent.mkdir(parents=True, exist_ok=True)
+    except Exception as err:
+        logger.error("Failed to create heartbeat directory: %s", err)
+
     def touch_heartbeat() -> None:
         """Write heartbeat file used by container health checks."""
         try:
-            heartbeat_path = Path(heartbeat_file)
-            heartbeat_path.parent.mkdir(parents=True, exist_ok=True)
-            heartbeat_path.write_text(datetime.utcnow().isoformat(), encoding="utf-8")
+            heartbeat_path.write_text(datetime.now(timezone.utc).isoformat(), encoding="utf-8")
         except Exception as err:
-            logger.error(f"Failed to write heartbeat: {err}")
+            logger.error("Failed to write heartbeat: %s", err)
 
     async def send_admin_alert(message: str, parse_mode: str | None = None) -> bool:
         """Send operational alerts to admin chat via admin token when available."""
-        if not ADMIN_CHAT_ID:
+        if ADMIN_CHAT_ID_INT is None:
             return False
 
         alert_token = ADMIN_BOT_TOKEN or primary_token
@@ -113,33 +220,32 @@ def main() -> None:
             return False
 
         payload = {
-            "chat_id": int(ADMIN_CHAT_ID),
+            "chat_id": ADMIN_CHAT_ID_INT,
             "text": f"ALERT:\n{message[:3800]}",
         }
         if parse_mode:
             payload["parse_mode"] = parse_mode
 
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                response = await client.post(
-                    f"https://api.telegram.org/bot{alert_token}/sendMessage",
-                    json=payload,
-                )
-                if response.status_code != 200:
-                    logger.error(f"Failed to send admin alert: {response.text}")
-                    return False
-                return True
+            response = await post_json(
+                f"https://api.telegram.org/bot{alert_token}/sendMessage",
+                payload,
+            )
+            if response.status_code != 200:
+                logger.error("Failed to send admin alert: %s", response.text)
+                return False
+            return True
         except Exception as err:
-            logger.error(f"Failed to send admin alert: {err}")
+            logger.error("Failed to send admin alert: %s", err)
             return False
 
     async def on_error(update: object, context) -> None:
         """Global error handler for uncaught bot exceptions."""
-        error_text = str(context.error)
-        if "message is not modified" in error_text.lower():
-            logger.info(f"Ignoring benign Telegram edit no-op ({role}): {error_text}")
+        error = context.error
+        if isinstance(error, BadRequest) and any(frag in str(error) for frag in _BENIGN_BAD_REQUESTS):
+            logger.info("Ignoring benign Telegram edit no-op (%s): %s", role, error)
             return
-        logger.error(f"Unhandled bot exception ({role}): {context.error}")
+        logger.error("Unhandled bot exception (%s): %s", role, context.error)
         await send_admin_alert(f"Unhandled bot exception ({role}): {context.error}")
 
     application.add_error_handler(on_error)
@@ -150,172 +256,138 @@ def main() -> None:
 
     job_queue = application.job_queue
 
+    async def flush_persistence(context) -> None:
+        """Write conversation state to disk once per cycle if it changed."""
+        _ = context
+        await persistence.flush()
+
+    if job_queue is not None:
+        # Offset from PTB's own update_persistence cycle so the write sees that cycle's changes
+        job_queue.run_repeating(
+            flush_persistence,
+            interval=timedelta(seconds=persistence.update_interval),
+            first=timedelta(seconds=persistence.update_interval + 5),
+        )
+
     if role == "client":
+        async def send_job_message(chat_id: int, text: str) -> None:
+            """
+            Posts a scheduled-job message straight to sendMessage on the shared client.
+            Job messages carry no keyboard or conversation state, so PTB's request and
+            Message-parsing layers are skipped. Raises on failure like bot.send_message.
+            """
+            response = await post_json(
+                f"https://api.telegram.org/bot{primary_token}/sendMessage",
+                {"chat_id": chat_id, "text": text, "parse_mode": "Markdown"},
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"sendMessage {response.status_code}: {response.text}")
+
         async def check_expired_subscriptions(context):
             """Deactivate expired subscriptions and send trial expiry/winback messages."""
+            _ = context
             touch_heartbeat()
-            count = db.deactivate_expired_subscriptions()
-            if count > 0:
-                logger.info(f"Deactivated {count} expired subscription(s)")
+            tick = await asyncio.to_thread(db.run_expiry_tick, TRIAL_WINBACK_AFTER_HOURS)
+            if tick["deactivated"] > 0:
+                logger.info("Deactivated %s expired subscription(s)", tick["deactivated"])
 
-            expired_trials = db.get_unnotified_expired_trials()
-            for provider in expired_trials:
+            async def notify_trial_expired(provider):
                 tg_id = provider.get("telegram_id")
-                name = provider.get("display_name", "there")
+                name = escape_markdown(provider.get("display_name") or "there")
                 try:
-                    await context.bot.send_message(
-                        chat_id=tg_id,
-                        text=(
-                            "? *Free Trial Ended*\n\n"
-                            f"Hi {name}, your trial has ended and your listing is now paused.\n\n"
-                            "To go live again immediately, choose any paid package in ?? Top up Balance."
-                        ),
-                        parse_mode="Markdown",
-                    )
-                    db.mark_trial_expired_notified(tg_id)
+                    await send_job_message(tg_id, TRIAL_EXPIRED_TEMPLATE.format(name=name))
+                    return tg_id
                 except Exception as err:
-                    logger.error(f"Failed trial-expired notification to {tg_id}: {err}")
+                    logger.error("Failed trial-expired notification to %s: %s", tg_id, err)
                     await send_admin_alert(f"Trial-expired notification failed for {tg_id}: {err}")
+                    return None
 
-            winback_candidates = db.get_trial_winback_candidates(TRIAL_WINBACK_AFTER_HOURS)
-            winback_sent = 0
-            for provider in winback_candidates:
+            async def send_trial_winback(provider):
                 tg_id = provider.get("telegram_id")
-                name = provider.get("display_name", "there")
+                name = escape_markdown(provider.get("display_name") or "there")
                 try:
-                    await context.bot.send_message(
-                        chat_id=tg_id,
-                        text=(
-                            "*We can bring you back live today*\n\n"
-                            f"Hi {name}, it has been about {TRIAL_WINBACK_AFTER_HOURS} hours since your trial ended.\n\n"
-                            "Activate any paid package in Top up Balance and we can put your listing back online instantly."
-                        ),
-                        parse_mode="Markdown",
-                    )
-                    db.mark_trial_winback_sent(tg_id)
-                    winback_sent += 1
+                    await send_job_message(tg_id, TRIAL_WINBACK_TEMPLATE.format(name=name))
+                    return tg_id
                 except Exception as err:
-                    logger.error(f"Failed trial winback to {tg_id}: {err}")
+                    logger.error("Failed trial winback to %s: %s", tg_id, err)
                     await send_admin_alert(f"Trial winback send failed for {tg_id}: {err}")
+                    return None
+
+            results = await _run_bounded(tick["expired_trials"], notify_trial_expired)
+            notified_ids = [tg_id for tg_id in results if tg_id]
+            if notified_ids:
+                await asyncio.to_thread(db.mark_trials_expired_notified, notified_ids)
 
-            if winback_sent:
-                logger.info(f"Trial winback messages sent: {winback_sent}")
+            results = await _run_bounded(tick["winback"], send_trial_winback)
+            winback_ids = [tg_id for tg_id in results if tg_id]
+            if winback_ids:
+                await asyncio.to_thread(db.mark_trial_winbacks_sent, winback_ids)
+                logger.info("Trial winback messages sent: %s", len(winback_ids))
 
         async def check_trial_reminders(context):
             """Send day-2, day-5 and final trial reminders."""
+            _ = context
             touch_heartbeat()
-            now = datetime.now()
-            candidates = db.get_trial_reminder_candidates()
-            day2_sent = 0
-            day5_sent = 0
-            final_sent = 0
-
-            for provider in candidates:
-                tg_id = provider.get("telegram_id")
-                expiry = provider.get("expiry_date")
-                if not tg_id or not expiry:
-                    continue
-
-                hours_left = (expiry - now).total_seconds() / 3600.0
-                if hours_left <= 0:
-                    continue
-
-                display_name = provider.get("display_name", "there")
+            buckets = await asyncio.to_thread(
+                db.get_trial_reminder_buckets,
+                FREE_TRIAL_REMINDER_DAY2_HOURS,
+                FREE_TRIAL_REMINDER_DAY5_HOURS,
+                FREE_TRIAL_FINAL_REMINDER_HOURS,
+            )
+            sent_counts = {}
 
-                if (
-                    hours_left <= FREE_TRIAL_FINAL_REMINDER_HOURS
-                    and not provider.get("trial_reminder_lastday_sent")
-                ):
-                    try:
-                        await context.bot.send_message(
-                            chat_id=tg_id,
-                            text=(
-                                "?? *Trial Ending Soon*\n\n"
-                                f"Hi {display_name}, your free trial ends in less than 24 hours.\n\n"
-                                "Tap ?? Top up Balance now to keep your listing live with no downtime."
-                            ),
-                            parse_mode="Markdown",
-                        )
-                        db.mark_trial_reminder_sent(tg_id, "lastday")
-                        final_sent += 1
-                    except Exception as err:
-                        logger.error(f"Failed final trial reminder to {tg_id}: {err}")
-                        await send_admin_alert(f"Final trial reminder failed for {tg_id}: {err}")
-                    continue
-
-                if (
-                    hours_left <= FREE_TRIAL_REMINDER_DAY5_HOURS
-                    and hours_left > FREE_TRIAL_FINAL_REMINDER_HOURS
-                    and not provider.get("trial_reminder_day5_sent")
-                ):
+            for reminder_type, label, template in TRIAL_REMINDERS:
+                async def send_reminder(provider, label=label, template=template):
+                    tg_id = provider.get("telegram_id")
+                    display_name = escape_markdown(provider.get("display_name") or "there")
                     try:
-                        await context.bot.send_message(
-                            chat_id=tg_id,
-                            text=(
-                                "?? *Trial Reminder*\n\n"
-                                f"Hi {display_name}, your free trial is nearing its end.\n\n"
-                                "Choose a paid package in ?? Top up Balance to stay visible without interruption."
-                            ),
-                            parse_mode="Markdown",
-                        )
-                        db.mark_trial_reminder_sent(tg_id, "day5")
-                        day5_sent += 1
+                        await send_job_message(tg_id, template.format(name=display_name))
+                        return tg_id
                     except Exception as err:
-                        logger.error(f"Failed day-5 trial reminder to {tg_id}: {err}")
-                        await send_admin_alert(f"Day-5 trial reminder failed for {tg_id}: {err}")
-                    continue
-
-                if (
-                    hours_left <= FREE_TRIAL_REMINDER_DAY2_HOURS
-                    and hours_left > FREE_TRIAL_REMINDER_DAY5_HOURS
-                    and not provider.get("trial_reminder_day2_sent")
-                ):
-                    try:
-                        await context.bot.send_message(
-                            chat_id=tg_id,
-                            text=(
-                                "?? *Trial Day-2 Check-in*\n\n"
-                                f"Hi {display_name}, your listing is now live and clients are already browsing.\n\n"
-                                "Quick win: keep photos and rates updated today so you get more responses this week."
-                            ),
-                            parse_mode="Markdown",
-                        )
-                        db.mark_trial_reminder_sent(tg_id, "day2")
-                        day2_sent += 1
-                    except Exception as err:
-                        logger.error(f"Failed day-2 trial reminder to {tg_id}: {err}")
-                        await send_admin_alert(f"Day-2 trial reminder failed for {tg_id}: {err}")
-
-            if day2_sent or day5_sent or final_sent:
-                logger.info(f"Trial reminders sent: day2={day2_sent}, day5={day5_sent}, final={final_sent}")
+                        logger.error("Failed %s trial reminder to %s: %s", label, tg_id, err)
+                        await send_admin_alert(f"{label.capitalize()} trial reminder failed for {tg_id}: {err}")
+                        return None
+
+                results = await _run_bounded(buckets[reminder_type], send_reminder)
+                sent_ids = [tg_id for tg_id in results if tg_id]
+                if sent_ids:
+                    await asyncio.to_thread(db.mark_trial_reminders_sent, sent_ids, reminder_type)
+                sent_counts[reminder_type] = len(sent_ids)
+
+            if any(sent_counts.values()):
+                logger.info(
+                    "Trial reminders sent: day2=%s, day5=%s, final=%s",
+                    sent_counts["day2"], sent_counts["day5"], sent_counts["lastday"],
+                )
 
         async def check_overdue_sessions(context):
             """Alert admin about overdue safety sessions."""
             _ = context
             touch_heartbeat()
-            overdue = db.get_overdue_sessions()
+            overdue = await asyncio.to_thread(db.get_overdue_sessions)
+            alerted_ids = []
             for session in overdue:
                 provider_name = session.get("display_name", "Unknown")
                 provider_phone = session.get("phone", "N/A")
                 expected_back = session.get("expected_check_back")
 
-                alert_text = (
-                    "?? *EMERGENCY: OVERDUE CHECK-IN*\n"
-                    "??????????????????????????\n\n"
-                    f"?? Provider: *{provider_name}*\n"
-                    f"?? Phone: `{provider_phone}`\n"
-                    f"? Expected back: {expected_back.strftime('%H:%M') if expected_back else 'Unknown'}\n\n"
-                    "*Provider has NOT checked in!*\n"
-                    "Immediate follow-up recommended."
+                alert_text = OVERDUE_ALERT_TEMPLATE.format(
+                    name=escape_markdown(provider_name),
+                    phone=provider_phone,
+                    back=expected_back.strftime("%H:%M") if expected_back else "Unknown",
                 )
 
                 try:
                     sent = await send_admin_alert(alert_text, parse_mode="Markdown")
                     if sent:
-                        db.mark_session_alerted(session["id"])
-                        logger.warning(f"Overdue session alert sent for {provider_name}")
+                        alerted_ids.append(session["id"])
+                        logger.warning("Overdue session alert sent for %s", provider_name)
                 except Exception as err:
-                    logger.error(f"Failed overdue alert for {provider_name}: {err}")
+                    logger.error("Failed overdue alert for %s: %s", provider_name, err)
+
+            # Marked only after sending: a crash mid-loop re-alerts rather than losing an alert.
+            if alerted_ids:
+                await asyncio.to_thread(db.mark_sessions_alerted, alerted_ids)
 
         if job_queue is not None:
             touch_heartbeat()
@@ -340,9 +412,9 @@ def main() -> None:
             logger.warning("JobQueue unavailable; admin heartbeat will only update on startup")
 
     logger.info("Bot is starting...")
-    logger.info(f"Role: {role}")
-    logger.info(f"Heartbeat file: {heartbeat_file}")
-    logger.info(f"Persistence file: {persistence_file}")
+    logger.info("Role: %s", role)
+    logger.info("Heartbeat file: %s", heartbeat_file)
+    logger.info("Persistence file: %s", persistence_file)
 
     application.run_polling(allowed_updates=Update.ALL_TYPES)
 
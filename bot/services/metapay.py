@@ -2,9 +2,13 @@
 MegaPay STK Push Service
 Handles M-Pesa payments via MegaPay API
 """
+import asyncio
 import httpx
 import logging
-import uuid
+import random
+import re
+import secrets
+import time
 
 from config import (
     MEGAPAY_API_KEY,
@@ -12,10 +16,63 @@ from config import (
     MEGAPAY_STK_ENDPOINT,
     PACKAGES,
 )
+from utils.http_client import get_http_client, loads_json
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# MegaPay can take a while to hand the request to Safaricom
+STK_PUSH_TIMEOUT_SECONDS = 30.0
+
+# Kenyan MSISDN as MegaPay expects it: 254 followed by 9 digits
+_MSISDN_RE = re.compile(r"254\d{9}")
+
+
+# Only failures to connect are retried: nothing reached MegaPay, so a retry
+# cannot put a second STK prompt on the customer's phone.
+STK_CONNECT_RETRIES = 2
+
+# After this many consecutive failures, fail fast for CIRCUIT_OPEN_SECONDS
+# instead of making every payer wait out the timeout.
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_SECONDS = 30
+
+_consecutive_failures = 0
+_circuit_open_until = 0.0
+
+
+def _record_outcome(ok: bool) -> None:
+    """Updates the circuit breaker with the result of one MegaPay call."""
+    global _consecutive_failures, _circuit_open_until
+    if ok:
+        _consecutive_failures = 0
+        return
+    _consecutive_failures += 1
+    if _consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+        _circuit_open_until = time.monotonic() + CIRCUIT_OPEN_SECONDS
+        logger.error("❌ MegaPay circuit open for %ss after %s failures", CIRCUIT_OPEN_SECONDS, _consecutive_failures)
+
+
+async def _post_stk_push(payload: dict) -> "httpx.Response":
+    """POSTs the STK push, retrying connection failures with jittered backoff."""
+    for attempt in range(STK_CONNECT_RETRIES + 1):
+        try:
+            return await get_http_client().post(
+                MEGAPAY_STK_ENDPOINT, json=payload, timeout=STK_PUSH_TIMEOUT_SECONDS
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            if attempt == STK_CONNECT_RETRIES:
+                raise
+            logger.warning("⚠️ STK Push connect failed (attempt %s): %s", attempt + 1, e)
+        await asyncio.sleep(min(2.0, 0.2 * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+
+def normalize_msisdn(phone: str) -> str | None:
+    """Converts 07.../+254.../254... input to 2547XXXXXXXX; returns None if it is not valid."""
+    phone = phone.strip().lstrip("+")
+    if phone.startswith("0"):
+        phone = "254" + phone[1:]
+    return phone if _MSISDN_RE.fullmatch(phone) else None
+
 
 async def initiate_stk_push(phone: str, amount: int, telegram_id: int, package_days: int) -> dict:
     """
@@ -30,15 +87,26 @@ async def initiate_stk_push(phone: str, amount: int, telegram_id: int, package_d
     Returns:
         dict with success status and message
     """
-    # Format phone number (ensure it starts with 254)
-    if phone.startswith("0"):
-        phone = "254" + phone[1:]
-    elif phone.startswith("+"):
-        phone = phone[1:]
+    phone = normalize_msisdn(phone)
+    if phone is None:
+        logger.warning("⚠️ STK Push rejected: invalid phone for %s", telegram_id)
+        return {
+            "success": False,
+            "message": "Invalid M-Pesa number. Use the format 07XXXXXXXX or 2547XXXXXXXX.",
+            "reference": None,
+        }
+    
+    if time.monotonic() < _circuit_open_until:
+        logger.warning("⚠️ STK Push skipped for %s: MegaPay circuit open", telegram_id)
+        return {
+            "success": False,
+            "message": "Payment service unavailable. Please try again later.",
+            "reference": None,
+        }
     
     # Prepare payload per MegaPay API documentation.
     # Reference is unique per transaction to support idempotency safely.
-    reference = f"BB_{telegram_id}_{package_days}_{uuid.uuid4().hex[:10]}"
+    reference = f"BB_{telegram_id}_{package_days}_{secrets.token_hex(5)}"
     payload = {
         "api_key": MEGAPAY_API_KEY,
         "email": MEGAPAY_EMAIL,
@@ -47,53 +115,63 @@ async def initiate_stk_push(phone: str, amount: int, telegram_id: int, package_d
         "reference": reference,  # BB_123456789_3_ab12cd34ef
     }
     
-    logger.info(f"📱 Initiating STK Push: {phone} - {amount} KES - {package_days} days")
-    logger.info(f"📡 Endpoint: {MEGAPAY_STK_ENDPOINT}")
+    logger.info("📱 Initiating STK Push: %s - %s KES - %s days", phone, amount, package_days)
+    logger.info("📡 Endpoint: %s", MEGAPAY_STK_ENDPOINT)
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(MEGAPAY_STK_ENDPOINT, json=payload)
-            
-            logger.info(f"📬 Response status: {response.status_code}")
-            logger.info(f"📬 Response body: {response.text}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                # Check if MegaPay returned success
-                if data.get("success") == "200" or data.get("ResponseCode") == 0:
-                    logger.info(f"✅ STK Push sent successfully: {data}")
-                    return {
-                        "success": True,
-                        "message": "STK Push sent! Check your phone for the M-Pesa prompt.",
-                        "reference": reference,
-                        "data": data
-                    }
-                else:
-                    logger.error(f"❌ STK Push API error: {data}")
-                    return {
-                        "success": False,
-                        "message": f"Payment request failed: {data.get('message', data.get('ResponseDescription', 'Unknown error'))}",
-                        "reference": reference,
-                        "error": data
-                    }
+        response = await _post_stk_push(payload)
+        _record_outcome(response.status_code < 500)
+        
+        logger.info("📬 Response status: %s", response.status_code)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📬 Response body: %s", response.text[:2000])
+        
+        if response.status_code == 200:
+            data = loads_json(response.content)
+            # Check if MegaPay returned success
+            if data.get("success") == "200" or data.get("ResponseCode") == 0:
+                logger.info("✅ STK Push sent successfully: %s", data)
+                return {
+                    "success": True,
+                    "message": "STK Push sent! Check your phone for the M-Pesa prompt.",
+                    "reference": reference,
+                    "data": data
+                }
             else:
-                logger.error(f"❌ STK Push failed: {response.status_code} - {response.text}")
+                logger.error("❌ STK Push API error: %s", data)
                 return {
                     "success": False,
-                    "message": f"Payment request failed. Please try again.",
+                    "message": f"Payment request failed: {data.get('message', data.get('ResponseDescription', 'Unknown error'))}",
                     "reference": reference,
-                    "error": response.text
+                    "error": data
                 }
-                
+        else:
+            logger.error("❌ STK Push failed: %s - %s", response.status_code, response.text)
+            return {
+                "success": False,
+                "message": f"Payment request failed. Please try again.",
+                "reference": reference,
+                "error": response.text
+            }
+            
     except httpx.TimeoutException:
+        _record_outcome(False)
         logger.error("❌ STK Push timeout")
         return {
             "success": False,
             "message": "Payment request timed out. Please try again.",
             "reference": reference,
         }
+    except httpx.TransportError as e:
+        _record_outcome(False)
+        logger.error("❌ STK Push error: %s", e)
+        return {
+            "success": False,
+            "message": "Payment service unavailable. Please try again later.",
+            "reference": reference,
+        }
     except Exception as e:
-        logger.error(f"❌ STK Push error: {e}")
+        logger.error("❌ STK Push error: %s", e)
         return {
             "success": False,
             "message": "Payment service unavailable. Please try again later.",
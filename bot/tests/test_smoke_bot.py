@@ -19,69 +19,70 @@ from unittest.mock import MagicMock
 # 1. Mock external dependencies
 # ──────────────────────────────────────────────────────────
 
-# Mock psycopg2
-if "psycopg2" not in sys.modules:
-    psycopg2 = types.ModuleType("psycopg2")
-
-    class _Psycopg2Error(Exception):
-        pass
-
-    class _OperationalError(_Psycopg2Error):
-        pass
-
-    extras = types.ModuleType("psycopg2.extras")
-    extensions = types.ModuleType("psycopg2.extensions")
-
-    class _Json:
-        def __init__(self, adapted: Any):
-            self.adapted = adapted
-
-    extras.Json = _Json
-    extras.RealDictCursor = object
-    extensions.TRANSACTION_STATUS_INERROR = 3
-    extensions.TRANSACTION_STATUS_UNKNOWN = 0
-    psycopg2.Error = _Psycopg2Error
-    psycopg2.OperationalError = _OperationalError
-    psycopg2.extras = extras
-    psycopg2.extensions = extensions
-    psycopg2.connect = MagicMock(return_value=MagicMock())
-    sys.modules["psycopg2"] = psycopg2
-    sys.modules["psycopg2.extras"] = extras
-    sys.modules["psycopg2.extensions"] = extensions
-
-# Mock telegram library — heavy C extensions we don't want to pull in
-if "telegram" not in sys.modules:
-    telegram = types.ModuleType("telegram")
-    telegram.Update = MagicMock
-    telegram.InlineKeyboardButton = MagicMock
-    telegram.InlineKeyboardMarkup = MagicMock
-    telegram.ReplyKeyboardMarkup = MagicMock
-    telegram.KeyboardButton = MagicMock
-    telegram.InputMediaPhoto = MagicMock
-    telegram.helpers = types.ModuleType("telegram.helpers")
-    telegram.helpers.escape_markdown = MagicMock(side_effect=lambda text, version=2: text)
-    telegram.error = types.ModuleType("telegram.error")
-    telegram.error.BadRequest = type("BadRequest", (Exception,), {})
-    sys.modules["telegram"] = telegram
-    sys.modules["telegram.helpers"] = telegram.helpers
-    sys.modules["telegram.error"] = telegram.error
-
-if "telegram.ext" not in sys.modules:
-    telegram_ext = types.ModuleType("telegram.ext")
-    telegram_ext.ContextTypes = MagicMock()
-    telegram_ext.CommandHandler = MagicMock
-    telegram_ext.MessageHandler = MagicMock
-    telegram_ext.CallbackQueryHandler = MagicMock
-    telegram_ext.ConversationHandler = MagicMock
-    telegram_ext.ApplicationBuilder = MagicMock
-    telegram_ext.filters = MagicMock()
-    telegram_ext.Application = MagicMock
-    sys.modules["telegram.ext"] = telegram_ext
-
-if "httpx" not in sys.modules:
-    httpx = types.ModuleType("httpx")
-    httpx.AsyncClient = MagicMock
-    sys.modules["httpx"] = httpx
+class _Psycopg2Error(Exception):
+    pass
+
+
+class _OperationalError(_Psycopg2Error):
+    pass
+
+
+class _Json:
+    def __init__(self, adapted: Any):
+        self.adapted = adapted
+
+
+# Module name -> attributes; parents are listed before their submodules.
+# telegram is stubbed because of its heavy C extensions, which we don't want to pull in.
+_STUB_MODULES: dict[str, dict[str, Any]] = {
+    "psycopg2": {
+        "Error": _Psycopg2Error,
+        "OperationalError": _OperationalError,
+        "connect": MagicMock(return_value=MagicMock()),
+    },
+    "psycopg2.extras": {"Json": _Json, "RealDictCursor": object},
+    "psycopg2.extensions": {
+        "TRANSACTION_STATUS_INERROR": 3,
+        "TRANSACTION_STATUS_UNKNOWN": 0,
+    },
+    "telegram": {
+        "Bot": MagicMock,
+        "Update": MagicMock,
+        "InlineKeyboardButton": MagicMock,
+        "InlineKeyboardMarkup": MagicMock,
+        "ReplyKeyboardMarkup": MagicMock,
+        "KeyboardButton": MagicMock,
+        "InputMediaPhoto": MagicMock,
+    },
+    "telegram.helpers": {
+        "escape_markdown": MagicMock(side_effect=lambda text, version=2: text),
+    },
+    "telegram.error": {"BadRequest": type("BadRequest", (Exception,), {})},
+    "telegram.ext": {
+        "ContextTypes": MagicMock(),
+        "CommandHandler": MagicMock,
+        "MessageHandler": MagicMock,
+        "CallbackQueryHandler": MagicMock,
+        "ConversationHandler": MagicMock,
+        "ApplicationBuilder": MagicMock,
+        "filters": MagicMock(),
+        "Application": MagicMock,
+    },
+    "httpx": {"AsyncClient": MagicMock},
+}
+
+# Leave real libraries (or stubs installed by another test module) untouched
+_PRELOADED = {name.partition(".")[0] for name in _STUB_MODULES if name in sys.modules}
+
+for _name, _attrs in _STUB_MODULES.items():
+    if _name in sys.modules or _name.partition(".")[0] in _PRELOADED:
+        continue
+    _module = sys.modules[_name] = types.ModuleType(_name)
+    for _attr, _value in _attrs.items():
+        setattr(_module, _attr, _value)
+    _parent, _, _child = _name.rpartition(".")
+    if _parent:
+        setattr(sys.modules[_parent], _child, _module)
 
 # Ensure bot/ and root/ are on sys.path
 BOT_DIR = Path(__file__).resolve().parents[1]
@@ -172,9 +173,11 @@ class TestConfigImport(unittest.TestCase):
 class TestBotDatabaseStructure(unittest.TestCase):
     """Verify Database class has all expected methods."""
 
-    def setUp(self):
+    @classmethod
+    def setUpClass(cls):
+        # Tests only check attributes, so one instance serves the whole class
         from database import Database
-        self.db = Database()
+        cls.db = Database()
 
     def test_has_provider_methods(self):
         expected = [
@@ -217,9 +220,14 @@ class TestBotDatabaseStructure(unittest.TestCase):
         expected = [
             "activate_free_trial",
             "get_trial_reminder_candidates",
+            "get_trial_reminder_buckets",
             "mark_trial_reminder_sent",
+            "mark_trial_reminders_sent",
             "get_unnotified_expired_trials",
             "get_trial_winback_candidates",
+            "run_expiry_tick",
+            "mark_trials_expired_notified",
+            "mark_trial_winbacks_sent",
         ]
         for method in expected:
             self.assertTrue(hasattr(self.db, method), f"Missing: {method}")
@@ -276,11 +284,113 @@ class TestDbContext(unittest.TestCase):
         self.assertIsNone(get_db())
 
 
+class TestBlacklistCache(unittest.TestCase):
+    """Verify blacklist lookups are cached and invalidated."""
+
+    def test_cache_hit_and_invalidate(self):
+        from db_context import set_db
+        from handlers.safety_cache import cached_check_blacklist, invalidate_blacklist_cache
+        db = MagicMock()
+        db.check_blacklist.return_value = {"blacklisted": False}
+        set_db(db)
+        try:
+            invalidate_blacklist_cache()
+            cached_check_blacklist("0712345678")
+            cached_check_blacklist("0712345678")
+            self.assertEqual(db.check_blacklist.call_count, 1)
+            invalidate_blacklist_cache()
+            cached_check_blacklist("0712345678")
+            self.assertEqual(db.check_blacklist.call_count, 2)
+        finally:
+            set_db(None)
+
+    def test_errors_not_cached(self):
+        from db_context import set_db
+        from handlers.safety_cache import cached_check_blacklist, invalidate_blacklist_cache
+        db = MagicMock()
+        db.check_blacklist.return_value = {"blacklisted": False, "error": "down"}
+        set_db(db)
+        try:
+            invalidate_blacklist_cache()
+            cached_check_blacklist("0700000000")
+            cached_check_blacklist("0700000000")
+            self.assertEqual(db.check_blacklist.call_count, 2)
+        finally:
+            set_db(None)
+
+
+class TestProviderCache(unittest.TestCase):
+    """Verify provider rows are cached and invalidated."""
+
+    def test_cache_hit_and_invalidate(self):
+        from db_context import set_db
+        from handlers.provider_cache import cached_get_provider, invalidate_provider
+        db = MagicMock()
+        db.get_provider.return_value = {"telegram_id": 42, "display_name": "Amani"}
+        set_db(db)
+        try:
+            invalidate_provider(42)
+            cached_get_provider(42)
+            cached_get_provider(42)
+            self.assertEqual(db.get_provider.call_count, 1)
+            invalidate_provider(42)
+            cached_get_provider(42)
+            self.assertEqual(db.get_provider.call_count, 2)
+        finally:
+            invalidate_provider(42)
+            set_db(None)
+
+
 # ──────────────────────────────────────────────────────────
 # 5. Formatters Module Tests
 # ──────────────────────────────────────────────────────────
 
 
+class TestMegaPay(unittest.TestCase):
+    """Verify STK push input handling."""
+
+    def test_normalize_msisdn(self):
+        from services.metapay import normalize_msisdn
+        self.assertEqual(normalize_msisdn("0712345678"), "254712345678")
+        self.assertEqual(normalize_msisdn("+254712345678"), "254712345678")
+        self.assertEqual(normalize_msisdn("254112345678"), "254112345678")
+        self.assertIsNone(normalize_msisdn("+2540712345678"))
+        self.assertIsNone(normalize_msisdn("12345"))
+
+
+class TestAdminVerificationRequest(unittest.TestCase):
+    """Verify the admin-bot photo fallbacks."""
+
+    def test_rejected_upload_falls_back_to_proxy_url(self):
+        import asyncio
+        from unittest.mock import AsyncMock, patch
+        from handlers import verification
+
+        context = MagicMock()
+        context.bot.get_file = AsyncMock(
+            return_value=MagicMock(download_as_bytearray=AsyncMock(return_value=bytearray(b"jpg")))
+        )
+        client = MagicMock()
+        client.post = AsyncMock(return_value=MagicMock(status_code=400, text="Bad Request"))
+        post_json = AsyncMock(return_value=MagicMock(status_code=200))
+
+        with patch.object(verification, "ADMIN_CHAT_ID_INT", 1), \
+                patch.object(verification, "_SAME_TOKEN", False), \
+                patch.object(verification, "_admin_keyboard_payload", return_value={}), \
+                patch.object(verification, "get_http_client", return_value=client), \
+                patch.object(verification, "post_json", post_json):
+            sent = asyncio.run(
+                verification.send_admin_verification_request(context, 42, "file-id", "caption")
+            )
+
+        self.assertTrue(sent)
+        client.post.assert_awaited_once()
+        post_json.assert_awaited_once()
+        url, payload = post_json.await_args.args
+        self.assertTrue(url.endswith("/sendPhoto"))
+        self.assertEqual(payload["photo"], verification._public_photo_url("file-id"))
+
+
 class TestFormatters(unittest.TestCase):
     """Verify formatter utility functions."""
 
@@ -306,6 +416,24 @@ class TestFormatters(unittest.TestCase):
         self.assertIn("Platinum", format_tier_badge("platinum"))
         self.assertIn("Gold", format_tier_badge("gold"))
 
+    def test_escape_markdown(self):
+        from utils.formatters import escape_markdown
+        self.assertEqual(escape_markdown("Jane_Doe *VIP*"), "Jane\\_Doe \\*VIP\\*")
+        self.assertEqual(escape_markdown("Plain Name"), "Plain Name")
+
+    def test_format_expiry_date_keeps_timezones_apart(self):
+        from datetime import datetime, timedelta, timezone
+        from utils.formatters import format_expiry_date
+        utc = datetime(2026, 1, 2, 9, 0, tzinfo=timezone.utc)
+        nairobi = utc.astimezone(timezone(timedelta(hours=3)))
+        self.assertEqual(format_expiry_date(utc), "2026-01-02 09:00")
+        self.assertEqual(format_expiry_date(nairobi), "2026-01-02 12:00")
+
+    def test_utils_exports_match_formatters_all(self):
+        import utils
+        from utils import formatters
+        self.assertCountEqual(utils._SUBMODULE_EXPORTS[".formatters"], formatters.__all__)
+
     def test_format_welcome_message(self):
         from utils.formatters import format_welcome_message
         msg = format_welcome_message()
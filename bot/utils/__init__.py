@@ -1,6 +1,75 @@
 """
 Blackbook Bot Utilities
+Submodules are imported on first attribute access (PEP 562), so importing
+utils.logger or utils.formatters does not pull in telegram and config.
 """
-from .keyboards import *
-from .formatters import *
-from .logger import get_logger, setup_logger, configure_root_logger
+import importlib
+
+_SUBMODULE_EXPORTS = {
+    ".keyboards": (
+        "MAIN_MENU_BUTTONS",
+        "get_persistent_main_menu",
+        "get_main_menu_keyboard",
+        "get_back_button",
+        "get_skip_cancel_keyboard",
+        "get_city_keyboard",
+        "get_full_profile_keyboard",
+        "get_profile_keyboard",
+        "get_package_keyboard",
+        "get_menu_package_keyboard",
+        "get_boost_keyboard",
+        "get_referral_keyboard",
+        "get_phone_confirm_keyboard",
+        "get_topup_phone_confirm_keyboard",
+        "get_payment_failed_keyboard",
+        "get_payment_pending_keyboard",
+        "get_safety_menu_keyboard",
+        "get_safety_input_cancel_keyboard",
+        "get_session_duration_keyboard",
+        "get_session_active_keyboard",
+        "get_verification_start_keyboard",
+        "get_admin_verification_keyboard",
+        "get_build_keyboard",
+        "get_availability_keyboard",
+        "get_services_keyboard",
+        "get_languages_keyboard",
+        "get_neighborhood_keyboard",
+        "get_photo_management_keyboard",
+        "get_photo_delete_keyboard",
+        "get_photo_reorder_keyboard",
+        "get_photo_viewer_keyboard",
+        "get_online_toggle_keyboard",
+    ),
+    # Must match formatters.__all__; the smoke tests assert it
+    ".formatters": (
+        "TIER_BADGES",
+        "generate_verification_code",
+        "escape_markdown",
+        "format_tier_badge",
+        "format_status_badge",
+        "format_expiry_date",
+        "format_profile_text",
+        "format_welcome_message",
+        "format_returning_user_message",
+        "format_main_menu_header",
+        "format_full_profile_text",
+    ),
+    ".logger": ("get_logger", "setup_logger", "configure_root_logger"),
+}
+
+_EXPORTS = {name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,25 @@
+"""
+Blackbook Bot - Update Filters
+Custom PTB filters that keep catch-all text handlers out of the dispatch
+path for users who are not in the matching input mode.
+"""
+from telegram import Update
+from telegram.ext import filters
+
+
+class UserDataFlagFilter(filters.UpdateFilter):
+    """Matches updates from users whose user_data has a truthy value for `key`."""
+
+    def __init__(self, user_data, key: str):
+        """
+        Args:
+            user_data: The application's user_data mapping (application.user_data)
+            key: The user_data key that marks the input mode
+        """
+        super().__init__(name=f"UserDataFlagFilter({key})")
+        self._user_data = user_data
+        self._key = key
+
+    def filter(self, update: Update) -> bool:
+        user = update.effective_user
+        return bool(user and self._user_data.get(user.id, {}).get(self._key))
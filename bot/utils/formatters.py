@@ -4,13 +4,42 @@ Utility functions for formatting messages and text styling.
 """
 import ast
 import json
-import random
+import secrets
 import string
+from collections.abc import Mapping
+from functools import lru_cache
+from types import MappingProxyType
+
+# Public export list; keep the ".formatters" tuple in utils/__init__.py in sync with it
+__all__ = [
+    "TIER_BADGES",
+    "generate_verification_code",
+    "escape_markdown",
+    "format_tier_badge",
+    "format_status_badge",
+    "format_expiry_date",
+    "format_profile_text",
+    "format_welcome_message",
+    "format_returning_user_message",
+    "format_main_menu_header",
+    "format_full_profile_text",
+]
+
+_CODE_ALPHABET = string.ascii_uppercase + string.digits
 
 
 def generate_verification_code() -> str:
     """Generates a random 6-character verification code."""
-    return ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    return ''.join(secrets.choice(_CODE_ALPHABET) for _ in range(6))
+
+
+# Characters with meaning in Telegram's legacy Markdown parse_mode
+_MARKDOWN_ESCAPES = str.maketrans({c: "\\" + c for c in "_*`["})
+
+
+def escape_markdown(text: str) -> str:
+    """Escapes user-supplied text for messages sent with parse_mode="Markdown"."""
+    return str(text).translate(_MARKDOWN_ESCAPES)
 
 
 # Tier display mapping
@@ -24,25 +53,51 @@ TIER_BADGES = {
 }
 
 
+# Rate columns in display order, with their labels
+_RATE_FIELDS = (
+    ("rate_30min", "30 min"),
+    ("rate_1hr", "1 hour"),
+    ("rate_2hr", "2 hours"),
+    ("rate_3hr", "3 hours"),
+    ("rate_overnight", "Overnight"),
+)
+
+
 def format_tier_badge(tier: str) -> str:
     """Returns the formatted tier badge string."""
     return TIER_BADGES.get(tier, "—")
 
 
-def format_status_badge(is_online: bool, is_active: bool, is_verified: bool, tier: str = "none") -> dict:
-    """Returns formatted status badges."""
-    return {
+@lru_cache(maxsize=64)
+def _status_badges(is_online: bool, is_active: bool, is_verified: bool, tier: str) -> Mapping[str, str]:
+    return MappingProxyType({
         "status": "🟢 Active" if is_active else "⚫ Inactive",
         "online": "🟢 Live" if is_online else "⚫ Offline",
         "verified": "✔️ Verified" if is_verified else "❌ Unverified",
         "tier": format_tier_badge(tier),
-    }
+    })
+
+
+def format_status_badge(is_online: bool, is_active: bool, is_verified: bool, tier: str = "none") -> Mapping[str, str]:
+    """Returns formatted status badges as a shared read-only mapping."""
+    return _status_badges(bool(is_online), bool(is_active), bool(is_verified), tier)
+
+
+# A provider's expiry only changes on renewal, so menu re-renders reuse the string.
+# Aware datetimes for the same instant hash equal across zones, so tzinfo is part of the key.
+@lru_cache(maxsize=4096)
+def _cached_strftime(value, tzinfo, fmt: str) -> str:
+    return value.strftime(fmt)
+
+
+def _strftime(value, fmt: str) -> str:
+    return _cached_strftime(value, value.tzinfo, fmt)
 
 
 def format_expiry_date(expiry_date) -> str:
     """Formats the expiry date for display."""
     if expiry_date:
-        return expiry_date.strftime("%Y-%m-%d %H:%M")
+        return _strftime(expiry_date, "%Y-%m-%d %H:%M")
     return "No active subscription"
 
 
@@ -103,18 +158,11 @@ def format_profile_text(provider: dict) -> str:
     # Format rates if available
     rates_section = ""
     if provider.get("rate_1hr"):
-        rates_lines = []
-        if provider.get('rate_30min'):
-            rates_lines.append(f"   30 min: {provider.get('rate_30min'):,} KES")
-        if provider.get('rate_1hr'):
-            rates_lines.append(f"   1 hour: {provider.get('rate_1hr'):,} KES")
-        if provider.get('rate_2hr'):
-            rates_lines.append(f"   2 hours: {provider.get('rate_2hr'):,} KES")
-        if provider.get('rate_3hr'):
-            rates_lines.append(f"   3 hours: {provider.get('rate_3hr'):,} KES")
-        if provider.get('rate_overnight'):
-            rates_lines.append(f"   Overnight: {provider.get('rate_overnight'):,} KES")
-        
+        rates_lines = [
+            f"   {label}: {rate:,} KES"
+            for key, label in _RATE_FIELDS
+            if (rate := provider.get(key))
+        ]
         if rates_lines:
             rates_section = "\n💰 *Hourly Rates:*\n" + "\n".join(rates_lines)
     
@@ -170,7 +218,7 @@ def format_returning_user_message(provider: dict) -> str:
     )
     
     expiry = provider.get("expiry_date")
-    time_left = expiry.strftime('%Y-%m-%d') if expiry else "No active subscription"
+    time_left = _strftime(expiry, '%Y-%m-%d') if expiry else "No active subscription"
     
     tier_line = ""
     if badges['tier'] != '—':
@@ -198,7 +246,7 @@ def format_main_menu_header(provider: dict) -> str:
     )
     
     expiry = provider.get("expiry_date")
-    time_left = expiry.strftime('%Y-%m-%d') if expiry else "No subscription"
+    time_left = _strftime(expiry, '%Y-%m-%d') if expiry else "No subscription"
     
     return (
         "🎩 *ACE GIRLS COMMAND CENTER*\n"
@@ -249,22 +297,16 @@ def format_full_profile_text(provider: dict) -> str:
     if isinstance(photos, str):
         try:
             photos = json.loads(photos)
-        except:
+        except ValueError:
             photos = []
     photo_count = len(photos)
     
     # Rates
-    rates_lines = []
-    if provider.get('rate_30min'):
-        rates_lines.append(f"• 30 min — {provider.get('rate_30min'):,}")
-    if provider.get('rate_1hr'):
-        rates_lines.append(f"• 1 hour — {provider.get('rate_1hr'):,}")
-    if provider.get('rate_2hr'):
-        rates_lines.append(f"• 2 hours — {provider.get('rate_2hr'):,}")
-    if provider.get('rate_3hr'):
-        rates_lines.append(f"• 3 hours — {provider.get('rate_3hr'):,}")
-    if provider.get('rate_overnight'):
-        rates_lines.append(f"• Overnight — {provider.get('rate_overnight'):,}")
+    rates_lines = [
+        f"• {label} — {rate:,}"
+        for key, label in _RATE_FIELDS
+        if (rate := provider.get(key))
+    ]
     rates_text = "\n".join(rates_lines) if rates_lines else "• Not set"
     
     # Languages
@@ -0,0 +1,82 @@
+"""
+Blackbook Bot - Shared HTTP Client
+Lazily-created httpx.AsyncClient reused for raw Bot API and MegaPay calls so
+each request does not pay for a fresh connection and TLS handshake.
+"""
+import asyncio
+import json
+import random
+
+import httpx
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import h2
+except ImportError:  # pragma: no cover
+    h2 = None
+
+HTTP_TIMEOUT_SECONDS = 20.0
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Returns the shared client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=h2 is not None,
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=50,
+                keepalive_expiry=60,
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Closes the shared client. Called from the application's post_shutdown hook."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def dumps_json(payload: dict) -> bytes:
+    """Encodes a request body, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(content: bytes):
+    """Decodes a response body, using orjson when it is installed. Raises ValueError on bad JSON."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+async def post_json(url: str, payload: dict, retries: int = 0) -> "httpx.Response":
+    """
+    POSTs a JSON body through the shared client.
+    With `retries`, network errors and 5xx responses are retried with jittered
+    backoff; only use it where a duplicate delivery is acceptable.
+    """
+    body = dumps_json(payload)
+    for attempt in range(retries + 1):
+        try:
+            resp = await get_http_client().post(url, content=body, headers=_JSON_HEADERS)
+        except httpx.TransportError:
+            if attempt == retries:
+                raise
+        else:
+            if resp.status_code < 500 or attempt == retries:
+                return resp
+        await asyncio.sleep(min(2.0, 0.2 * 2 ** attempt) * random.uniform(0.5, 1.0))
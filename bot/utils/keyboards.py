@@ -1,17 +1,27 @@
 """
 Blackbook Bot Keyboards
 All InlineKeyboardMarkup and ReplyKeyboardMarkup builders.
+Builders for static or small-argument keyboards are lru_cached; markups are
+immutable, so one instance is safely shared by every reply.
 """
+from functools import lru_cache
+
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 from config import (
-    CITIES, PACKAGES, TIERS, SESSION_DURATIONS, BUILDS, AVAILABILITIES,
+    CITIES, PACKAGES, TIERS, BUILDS, AVAILABILITIES,
     SERVICES, LANGUAGES, NAIROBI_NEIGHBORHOODS, ELDORET_NEIGHBORHOODS,
-    BOOST_PRICE, BOOST_DURATION_HOURS, PREMIUM_VERIFY_PRICE, FREE_TRIAL_DAYS,
+    BOOST_PRICE, BOOST_DURATION_HOURS, FREE_TRIAL_DAYS,
 )
 
-
 # ==================== PERSISTENT MAIN MENU ====================
 
+# Texts sent by the persistent menu buttons; text-input flows treat these as "exit".
+MAIN_MENU_BUTTONS = frozenset((
+    "👑 The Collection", "👤 My Profile", "💰 Top up Balance",
+    "🛡️ Safety Suite", "🤝 Affiliate Program", "📞 Support", "📋 Rules",
+))
+
+@lru_cache(maxsize=None)
 def get_persistent_main_menu() -> ReplyKeyboardMarkup:
     """Returns the persistent bottom menu (always visible)."""
     keyboard = [
@@ -25,6 +35,7 @@ def get_persistent_main_menu() -> ReplyKeyboardMarkup:
 
 # ==================== MAIN MENU ====================
 
+@lru_cache(maxsize=None)
 def get_main_menu_keyboard() -> InlineKeyboardMarkup:
     """Returns the main menu keyboard for existing users."""
     keyboard = [
@@ -40,6 +51,7 @@ def get_main_menu_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=32)
 def get_back_button(callback_data: str = "menu_main") -> InlineKeyboardMarkup:
     """Returns a simple back button."""
     return InlineKeyboardMarkup([
@@ -47,6 +59,7 @@ def get_back_button(callback_data: str = "menu_main") -> InlineKeyboardMarkup:
     ])
 
 
+@lru_cache(maxsize=32)
 def get_skip_cancel_keyboard(skip_to: str = None) -> InlineKeyboardMarkup:
     """Returns skip and cancel buttons for edit prompts."""
     buttons = []
@@ -58,6 +71,7 @@ def get_skip_cancel_keyboard(skip_to: str = None) -> InlineKeyboardMarkup:
 
 # ==================== REGISTRATION ====================
 
+@lru_cache(maxsize=None)
 def get_city_keyboard() -> InlineKeyboardMarkup:
     """Returns city selection keyboard."""
     keyboard = []
@@ -158,6 +172,7 @@ def get_profile_keyboard(provider: dict) -> InlineKeyboardMarkup:
 
 # ==================== PAYMENT ====================
 
+@lru_cache(maxsize=None)
 def get_package_keyboard() -> InlineKeyboardMarkup:
     """Returns tier package selection keyboard."""
     keyboard = []
@@ -173,6 +188,7 @@ def get_package_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_menu_package_keyboard(show_trial: bool = False) -> InlineKeyboardMarkup:
     """Returns tier package selection keyboard (menu version with extras)."""
     keyboard = []
@@ -199,6 +215,7 @@ def get_menu_package_keyboard(show_trial: bool = False) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_boost_keyboard() -> InlineKeyboardMarkup:
     """Returns boost confirmation keyboard."""
     keyboard = [
@@ -221,6 +238,7 @@ def get_referral_keyboard(referral_code: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=128)
 def get_phone_confirm_keyboard(saved_phone: str) -> InlineKeyboardMarkup:
     """Returns phone confirmation keyboard."""
     keyboard = [
@@ -231,6 +249,7 @@ def get_phone_confirm_keyboard(saved_phone: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=128)
 def get_topup_phone_confirm_keyboard(saved_phone: str) -> InlineKeyboardMarkup:
     """Returns phone confirmation keyboard for /topup command."""
     keyboard = [
@@ -240,6 +259,7 @@ def get_topup_phone_confirm_keyboard(saved_phone: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_payment_failed_keyboard() -> InlineKeyboardMarkup:
     """Returns keyboard for failed payment."""
     keyboard = [
@@ -249,6 +269,7 @@ def get_payment_failed_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_payment_pending_keyboard() -> InlineKeyboardMarkup:
     """Returns keyboard shown after STK prompt to check payment status."""
     keyboard = [
@@ -261,6 +282,7 @@ def get_payment_pending_keyboard() -> InlineKeyboardMarkup:
 
 # ==================== SAFETY ====================
 
+@lru_cache(maxsize=None)
 def get_safety_menu_keyboard() -> InlineKeyboardMarkup:
     """Returns the safety suite menu keyboard."""
     keyboard = [
@@ -273,6 +295,7 @@ def get_safety_menu_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_safety_input_cancel_keyboard() -> InlineKeyboardMarkup:
     """Returns cancel keyboard shown during safety input (check/report)."""
     keyboard = [
@@ -281,6 +304,7 @@ def get_safety_input_cancel_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_session_duration_keyboard() -> InlineKeyboardMarkup:
     """Returns session duration selection keyboard."""
     keyboard = [
@@ -297,6 +321,7 @@ def get_session_duration_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_session_active_keyboard() -> InlineKeyboardMarkup:
     """Returns keyboard for active session."""
     keyboard = [
@@ -308,6 +333,7 @@ def get_session_active_keyboard() -> InlineKeyboardMarkup:
 
 # ==================== VERIFICATION ====================
 
+@lru_cache(maxsize=None)
 def get_verification_start_keyboard() -> InlineKeyboardMarkup:
     """Returns verification prompt keyboard."""
     keyboard = [
@@ -317,6 +343,7 @@ def get_verification_start_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=1024)
 def get_admin_verification_keyboard(provider_id: int) -> InlineKeyboardMarkup:
     """Returns admin verification keyboard with one-tap reject templates."""
     keyboard = [
@@ -332,6 +359,7 @@ def get_admin_verification_keyboard(provider_id: int) -> InlineKeyboardMarkup:
 
 # ==================== PROFILE COMPLETION ====================
 
+@lru_cache(maxsize=None)
 def get_build_keyboard() -> InlineKeyboardMarkup:
     """Returns build selection keyboard."""
     keyboard = [
@@ -341,6 +369,7 @@ def get_build_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(keyboard)
 
 
+@lru_cache(maxsize=None)
 def get_availability_keyboard() -> InlineKeyboardMarkup:
     """Returns availability selection keyboard."""
     keyboard = [
@@ -408,6 +437,7 @@ def get_languages_keyboard(selected_languages=None) -> InlineKeyboardMarkup:
 
 # ==================== NEIGHBORHOOD SELECTION ====================
 
+@lru_cache(maxsize=64)
 def get_neighborhood_keyboard(city: str, page: int = 0) -> InlineKeyboardMarkup:
     """Returns paginated neighborhood keyboard for a city."""
     neighborhoods = []
@@ -522,6 +552,7 @@ def get_photo_viewer_keyboard(current_idx: int, total: int) -> InlineKeyboardMar
 
 # ==================== ONLINE STATUS ====================
 
+@lru_cache(maxsize=None)
 def get_online_toggle_keyboard(is_online: bool) -> InlineKeyboardMarkup:
     """Returns online status toggle keyboard with current status."""
     status_text = "🟢 ONLINE" if is_online else "⚫ OFFLINE"
@@ -2,9 +2,12 @@
 Blackbook Bot - Centralized Logger
 Provides consistent logging across all modules.
 """
+import atexit
 import logging
+import queue
 import sys
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 
 
 class BlackbookFormatter(logging.Formatter):
@@ -12,7 +15,8 @@ class BlackbookFormatter(logging.Formatter):
     
     def format(self, record):
         # Format: [2026-01-23 10:00:00] [handlers.payment] [INFO] - Message
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # record.created, not now(): records are formatted later on the listener thread
+        timestamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
         level = record.levelname
         
         # Get module path (e.g., handlers.payment)
@@ -23,6 +27,25 @@ class BlackbookFormatter(logging.Formatter):
         return f"[{timestamp}] [{module}] [{level}] - {record.getMessage()}"
 
 
+# Loggers only enqueue records; a background thread does the stdout writes,
+# so logging from the event loop never blocks on I/O.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_queue_handler: QueueHandler | None = None
+
+
+def _get_queue_handler() -> QueueHandler:
+    """Returns the shared QueueHandler, starting its listener on first use."""
+    global _queue_handler
+    if _queue_handler is None:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(BlackbookFormatter())
+        listener = QueueListener(_log_queue, stream_handler)
+        listener.start()
+        atexit.register(listener.stop)
+        _queue_handler = QueueHandler(_log_queue)
+    return _queue_handler
+
+
 def setup_logger(name: str = None, level: int = logging.INFO) -> logging.Logger:
     """
     Sets up a logger with the Blackbook format.
@@ -38,9 +61,9 @@ def setup_logger(name: str = None, level: int = logging.INFO) -> logging.Logger:
     
     # Avoid adding duplicate handlers
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(BlackbookFormatter())
-        logger.addHandler(handler)
+        logger.addHandler(_get_queue_handler())
+        # The root logger feeds the same queue; propagating would print every line twice
+        logger.propagate = False
         logger.setLevel(level)
     
     return logger
@@ -68,6 +91,4 @@ def configure_root_logger(level: int = logging.INFO):
     # Clear existing handlers
     root_logger.handlers.clear()
     
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(BlackbookFormatter())
-    root_logger.addHandler(handler)
+    root_logger.addHandler(_get_queue_handler())
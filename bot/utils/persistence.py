@@ -0,0 +1,81 @@
+"""
+Blackbook Bot - Conversation Persistence
+PicklePersistence variant that writes the pickle file at most once per flush
+instead of once for every user/chat that changed in a persistence cycle.
+"""
+import os
+
+from telegram.ext import PicklePersistence
+
+
+class CoalescingPicklePersistence(PicklePersistence):
+    """
+    Keeps updates in memory and only marks the state dirty; flush() writes the
+    single pickle file when something changed. main.py runs flush() on a
+    repeating job, and PTB calls it once more on shutdown.
+    """
+
+    def __init__(self, filepath, update_interval: float = 60):
+        super().__init__(filepath=filepath, on_flush=True, update_interval=update_interval)
+        self._dirty = False
+
+    async def update_conversation(self, name, key, new_state) -> None:
+        await super().update_conversation(name, key, new_state)
+        self._dirty = True
+
+    async def update_user_data(self, user_id, data) -> None:
+        await super().update_user_data(user_id, data)
+        self._dirty = True
+
+    async def update_chat_data(self, chat_id, data) -> None:
+        await super().update_chat_data(chat_id, data)
+        self._dirty = True
+
+    async def update_bot_data(self, data) -> None:
+        # Called every cycle, not only for changes
+        if self.bot_data != data:
+            self._dirty = True
+        await super().update_bot_data(data)
+
+    async def update_callback_data(self, data) -> None:
+        if self.callback_data != data:
+            self._dirty = True
+        await super().update_callback_data(data)
+
+    async def drop_user_data(self, user_id) -> None:
+        await super().drop_user_data(user_id)
+        self._dirty = True
+
+    async def drop_chat_data(self, chat_id) -> None:
+        await super().drop_chat_data(chat_id)
+        self._dirty = True
+
+    # Both dump hooks are private PicklePersistence API; the package pins PTB 21.0.
+    def _dump_file(self, filepath, data) -> None:
+        # Written beside the target and swapped in, so a crash mid-dump cannot
+        # leave a truncated pickle that fails to load.
+        tmp_path = filepath.with_name(filepath.name + ".tmp")
+        super()._dump_file(tmp_path, data)
+        os.replace(tmp_path, filepath)
+
+    def _dump_singlefile(self) -> None:
+        # PTB's version writes the file directly; route it through _dump_file instead
+        self._dump_file(self.filepath, {
+            "conversations": self.conversations,
+            "user_data": self.user_data,
+            "chat_data": self.chat_data,
+            "bot_data": self.bot_data,
+            "callback_data": self.callback_data,
+        })
+
+    async def flush(self) -> None:
+        """Writes the pickle file if anything changed since the last write."""
+        if not self._dirty:
+            return
+        # Cleared before the write so updates landing mid-dump mark it dirty again
+        self._dirty = False
+        try:
+            await super().flush()
+        except Exception:
+            self._dirty = True
+            raise
@@ -13,19 +13,23 @@ class PaymentsRepository(BaseRepository):
 
     def activate_subscription(self, tg_id: int, days: int) -> bool:
             """Activates provider subscription for X days with tier name."""
-            expiry = datetime.now() + timedelta(days=days)
             # Map days to tier name
             tier_map = {3: "bronze", 7: "silver", 30: "gold", 90: "platinum"}
             tier_name = tier_map.get(days, "bronze")
+            # Expiry is computed on the DB clock, the same NOW() the expiry jobs compare against
             query = """UPDATE providers 
-                       SET is_active = TRUE, expiry_date = %s, subscription_tier = %s,
+                       SET is_active = TRUE, expiry_date = NOW() + (%s || ' days')::INTERVAL,
+                           subscription_tier = %s,
                            trial_expired_notified = FALSE,
                            trial_winback_sent = FALSE
-                       WHERE telegram_id = %s"""
+                       WHERE telegram_id = %s
+                       RETURNING expiry_date"""
             try:
                 with self.conn.cursor() as cur:
-                    cur.execute(query, (expiry, tier_name, tg_id))
+                    cur.execute(query, (days, tier_name, tg_id))
+                    result = cur.fetchone()
                     self.conn.commit()
+                    expiry = result["expiry_date"] if result else None
                     logger.info(f"✅ Activated {tier_name} subscription for {tg_id} until {expiry}")
                     return True
             except Exception as e:
@@ -49,15 +53,14 @@ class PaymentsRepository(BaseRepository):
 
     def boost_provider(self, tg_id: int, hours: int = 12) -> bool:
             """Boosts a provider's visibility for X hours (only if provider is active)."""
-            boost_until = datetime.now() + timedelta(hours=hours)
             query = """
                 UPDATE providers
-                SET boost_until = %s
+                SET boost_until = NOW() + (%s || ' hours')::INTERVAL
                 WHERE telegram_id = %s AND is_active = TRUE
             """
             try:
                 with self.conn.cursor() as cur:
-                    cur.execute(query, (boost_until, tg_id))
+                    cur.execute(query, (hours, tg_id))
                     self.conn.commit()
                     return cur.rowcount > 0
             except Exception as e:
@@ -264,14 +267,12 @@ class PaymentsRepository(BaseRepository):
 
     def is_boosted(self, tg_id: int) -> bool:
             """Checks if a provider currently has an active boost."""
-            query = "SELECT boost_until FROM providers WHERE telegram_id = %s"
+            query = "SELECT COALESCE(boost_until > NOW(), FALSE) AS boosted FROM providers WHERE telegram_id = %s"
             try:
                 with self.conn.cursor() as cur:
                     cur.execute(query, (tg_id,))
                     result = cur.fetchone()
-                    if result and result.get("boost_until"):
-                        return result["boost_until"] > datetime.now()
-                    return False
+                    return bool(result and result["boosted"])
             except Exception as e:
                 logger.error(f"❌ Error checking boost: {e}")
                 return False
@@ -96,19 +96,33 @@ class SafetyRepository(BaseRepository):
                 logger.error(f"❌ Error marking session alerted: {e}")
                 self.conn.rollback()
 
+    def mark_sessions_alerted(self, session_ids: List[int]) -> None:
+            """Marks several sessions as having alerted the admin in one UPDATE."""
+            if not session_ids:
+                return
+            query = "UPDATE sessions SET admin_alerted = TRUE WHERE id = ANY(%s)"
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute(query, (list(session_ids),))
+                    self.conn.commit()
+            except Exception as e:
+                logger.error(f"❌ Error marking sessions alerted: {e}")
+                self.conn.rollback()
+
     def start_session(self, tg_id: int, duration_minutes: int) -> int:
             """Starts a safety session timer. Returns session ID."""
-            expected_back = datetime.now() + timedelta(minutes=duration_minutes)
+            # DB clock, so get_overdue_sessions' NOW() comparison cannot drift from it
             query = """
             INSERT INTO sessions (telegram_id, expected_check_back)
-            VALUES (%s, %s)
-            RETURNING id
+            VALUES (%s, NOW() + (%s || ' minutes')::INTERVAL)
+            RETURNING id, expected_check_back
             """
             try:
                 with self.conn.cursor() as cur:
-                    cur.execute(query, (tg_id, expected_back))
+                    cur.execute(query, (tg_id, duration_minutes))
                     result = cur.fetchone()
                     self.conn.commit()
+                    expected_back = result["expected_check_back"] if result else None
                     logger.info(f"⏱️ Session started for {tg_id}, check-back at {expected_back}")
                     return result["id"] if result else 0
             except Exception as e:
@@ -95,6 +95,45 @@ class TrialsRepository(BaseRepository):
                 logger.error(f"❌ Error fetching trial reminder candidates: {e}")
                 return []
 
+    def get_trial_reminder_buckets(self, day2_hours: int, day5_hours: int, final_hours: int) -> Dict[str, List[dict]]:
+            """
+            Gets trial providers due a reminder, bucketed server-side by hours left.
+            Keys match mark_trial_reminder_sent types: day2|day5|lastday.
+            """
+            query = """
+            SELECT telegram_id, display_name, reminder_type
+            FROM (
+                SELECT telegram_id, display_name,
+                       CASE
+                           WHEN expiry_date <= NOW() + (%s || ' hours')::INTERVAL THEN
+                               CASE WHEN NOT COALESCE(trial_reminder_lastday_sent, FALSE) THEN 'lastday' END
+                           WHEN expiry_date <= NOW() + (%s || ' hours')::INTERVAL THEN
+                               CASE WHEN NOT COALESCE(trial_reminder_day5_sent, FALSE) THEN 'day5' END
+                           WHEN expiry_date <= NOW() + (%s || ' hours')::INTERVAL THEN
+                               CASE WHEN NOT COALESCE(trial_reminder_day2_sent, FALSE) THEN 'day2' END
+                       END AS reminder_type
+                FROM providers
+                WHERE is_active = TRUE
+                  AND is_verified = TRUE
+                  AND subscription_tier = 'trial'
+                  AND expiry_date > NOW()
+                  AND expiry_date <= NOW() + (%s || ' hours')::INTERVAL
+            ) due
+            WHERE reminder_type IS NOT NULL
+            """
+            buckets = {"day2": [], "day5": [], "lastday": []}
+            try:
+                with self.conn.cursor() as cur:
+                    # The widest window bounds the index range scan, so an idle tick
+                    # reads no rows beyond the reminder horizon.
+                    horizon = max(day2_hours, day5_hours, final_hours)
+                    cur.execute(query, (final_hours, day5_hours, day2_hours, horizon))
+                    for row in cur.fetchall():
+                        buckets[row["reminder_type"]].append(row)
+            except Exception as e:
+                logger.error(f"❌ Error fetching trial reminder buckets: {e}")
+            return buckets
+
     def get_trial_winback_candidates(self, hours_after_expiry: int = 24):
             """Gets expired trial providers eligible for post-expiry winback message."""
             query = """
@@ -134,6 +173,62 @@ class TrialsRepository(BaseRepository):
                 logger.error(f"❌ Error fetching expired trial notifications: {e}")
                 return []
 
+    def run_expiry_tick(self, hours_after_expiry: int = 24) -> dict:
+            """
+            One round trip for the expiry job: deactivates expired subscriptions and
+            returns {"deactivated", "expired_trials", "winback"}. Trials deactivated
+            by this same statement are included in expired_trials, since the
+            SELECTs cannot see the UPDATE.
+            """
+            query = """
+            WITH deact AS (
+                UPDATE providers
+                SET is_active = FALSE
+                WHERE expiry_date < NOW() AND is_active = TRUE
+                RETURNING telegram_id, display_name, subscription_tier, trial_expired_notified
+            ),
+            expired AS (
+                SELECT telegram_id, display_name
+                FROM deact
+                WHERE subscription_tier = 'trial'
+                  AND COALESCE(trial_expired_notified, FALSE) = FALSE
+                UNION
+                SELECT telegram_id, display_name
+                FROM providers
+                WHERE subscription_tier = 'trial'
+                  AND is_active = FALSE
+                  AND expiry_date IS NOT NULL
+                  AND expiry_date <= NOW()
+                  AND COALESCE(trial_expired_notified, FALSE) = FALSE
+            ),
+            winback AS (
+                SELECT telegram_id, display_name
+                FROM providers
+                WHERE subscription_tier = 'trial'
+                  AND is_active = FALSE
+                  AND expiry_date IS NOT NULL
+                  AND expiry_date <= NOW() - (%s || ' hours')::INTERVAL
+                  AND COALESCE(trial_expired_notified, FALSE) = TRUE
+                  AND COALESCE(trial_winback_sent, FALSE) = FALSE
+            )
+            SELECT
+                (SELECT COUNT(*) FROM deact) AS deactivated,
+                COALESCE((SELECT json_agg(expired) FROM expired), '[]'::json) AS expired_trials,
+                COALESCE((SELECT json_agg(winback) FROM winback), '[]'::json) AS winback
+            """
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute(query, (hours_after_expiry,))
+                    row = cur.fetchone()
+                    self.conn.commit()
+                    if row["deactivated"] > 0:
+                        logger.info(f"⏰ Deactivated {row['deactivated']} expired subscriptions")
+                    return dict(row)
+            except Exception as e:
+                logger.error(f"❌ Error running expiry tick: {e}")
+                self.conn.rollback()
+                return {"deactivated": 0, "expired_trials": [], "winback": []}
+
     def mark_trial_expired_notified(self, tg_id: int) -> bool:
             """Marks that trial-expired notification has been sent."""
             query = "UPDATE providers SET trial_expired_notified = TRUE WHERE telegram_id = %s"
@@ -167,6 +262,43 @@ class TrialsRepository(BaseRepository):
                 self.conn.rollback()
                 return False
 
+    def mark_trial_reminders_sent(self, tg_ids: List[int], reminder_type: str) -> bool:
+            """Marks a trial reminder as sent for many providers in one UPDATE. reminder_type: day2|day5|lastday."""
+            column = {
+                "day2": "trial_reminder_day2_sent",
+                "day5": "trial_reminder_day5_sent",
+                "lastday": "trial_reminder_lastday_sent",
+            }.get(reminder_type)
+            if column is None:
+                return False
+            if not tg_ids:
+                return True
+            query = f"UPDATE providers SET {column} = TRUE WHERE telegram_id = ANY(%s)"
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute(query, (list(tg_ids),))
+                    self.conn.commit()
+                    return True
+            except Exception as e:
+                logger.error(f"❌ Error marking trial reminders sent: {e}")
+                self.conn.rollback()
+                return False
+
+    def mark_trials_expired_notified(self, tg_ids: List[int]) -> bool:
+            """Marks the trial-expired notification as sent for many providers in one UPDATE."""
+            if not tg_ids:
+                return True
+            query = "UPDATE providers SET trial_expired_notified = TRUE WHERE telegram_id = ANY(%s)"
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute(query, (list(tg_ids),))
+                    self.conn.commit()
+                    return True
+            except Exception as e:
+                logger.error(f"❌ Error marking trials expired notified: {e}")
+                self.conn.rollback()
+                return False
+
     def mark_trial_winback_sent(self, tg_id: int) -> bool:
             """Marks that trial winback message has been sent."""
             query = "UPDATE providers SET trial_winback_sent = TRUE WHERE telegram_id = %s"
@@ -180,3 +312,17 @@ class TrialsRepository(BaseRepository):
                 self.conn.rollback()
                 return False
 
+    def mark_trial_winbacks_sent(self, tg_ids: List[int]) -> bool:
+            """Marks the trial winback message as sent for many providers in one UPDATE."""
+            if not tg_ids:
+                return True
+            query = "UPDATE providers SET trial_winback_sent = TRUE WHERE telegram_id = ANY(%s)"
+            try:
+                with self.conn.cursor() as cur:
+                    cur.execute(query, (list(tg_ids),))
+                    self.conn.commit()
+                    return True
+            except Exception as e:
+                logger.error(f"❌ Error marking trial winbacks sent: {e}")
+                self.conn.rollback()
+                return False
@@ -0,0 +1,5 @@
+-- Partial index for the overdue safety-session scan, which only reads unalerted active sessions.
+
+CREATE INDEX IF NOT EXISTS idx_sessions_overdue_pending
+    ON sessions (expected_check_back)
+    WHERE is_active = TRUE AND admin_alerted = FALSE;
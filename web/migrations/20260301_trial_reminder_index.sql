@@ -0,0 +1,5 @@
+-- Partial index for the trial reminder/expiry scans, which only look at active trials.
+
+CREATE INDEX IF NOT EXISTS idx_providers_active_trial_expiry
+    ON providers (expiry_date)
+    WHERE subscription_tier = 'trial' AND is_active = TRUE;